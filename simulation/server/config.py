@@ -19,6 +19,7 @@ timeSolving = 0
 level_of_simulation = 0 #0 - "Fully Random", 1 - "Random in the list", 2 - "SFM"
 test_automation = 0
 draw = 0
+debug = 0 # 1 - drop into pdb before each network simplex solve
 M = 0
 restrictions_data_cache = [[[[4, 1], [1, 2]], [2, 5], 1, 1.0, None, 2.0]]
 restrictions_are_set_in_cache = False
\ No newline at end of file
@@ -34,6 +34,7 @@ class HaltingEvent(Event):
         M = self.graph.number_of_nodes_in_space_graph 
         D = self.graph.graph_processor.d
         P = len(path)
+        history = self.agv.path_history = []
         for i in range(P):
             node = path[i]
             real_node = node % M + (M if node % M == 0 else 0)
@@ -48,10 +49,12 @@ class HaltingEvent(Event):
                     cost = cost + delta_cost
                     print(f'({delta_cost})===', end='')
                 print(f'{real_node}===', end='')
+                history.append({"node": real_node, "time": delta_cost if i > 0 else 0})
             else:
                 delta_cost = (float('inf') if(self.end_node != self.agv.target_node.id) else self.end_time - self.start_time)
                 cost = cost + delta_cost
                 print(f'({self.delta_t})/({delta_cost})==={real_node}===END. ', end='')
+                history.append({"node": real_node, "time": self.delta_t})
             prev = path[i]
         print(f'Total cost: {cost}. The AGV reaches its destination at {self.end_time}')
     
@@ -285,6 +288,7 @@ class ReachingTargetEvent(Event):
         M = self.graph.number_of_nodes_in_space_graph 
         D = self.graph.graph_processor.d
         P = len(path)
+        history = self.agv.path_history = []
         for i in range(P):
             node = path[i]
             real_node = node % M + (M if node % M == 0 else 0)
@@ -299,11 +303,13 @@ class ReachingTargetEvent(Event):
                     cost = cost + delta_cost
                     print(f'({delta_cost})===', end='')
                 print(f'{real_node}===', end='')
+                history.append({"node": real_node, "time": delta_cost if i > 0 else 0})
             else:
                 cost = cost + self.last_cost #+ delta_cost
                 delta_cost = self.last_cost #+ delta_cost
                 #print(f'({delta_cost})==={real_node}/{node}===END. ', end='')
                 print(f'({delta_cost})==={node}===END. ', end='')
+                history.append({"node": node, "time": delta_cost})
             prev = path[i]
         dest = path[-2]
         real_dest = M if dest % M == 0 else dest % M
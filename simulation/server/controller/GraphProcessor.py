@@ -45,6 +45,8 @@ class GraphProcessor:
         self._tardiness = 0
         self._space_edges = []
         self._ts_edges = []
+        # Tăng mỗi khi ts_edges bị thay thế hoặc sắp xếp lại (không đổi độ dài), để cache theo ts_edges biết cần làm mới
+        self._ts_edges_version = 0
         self._ts_nodes = []
         self._tsedges = []
         self._started_nodes = []
@@ -194,6 +196,11 @@ class GraphProcessor:
         if not isinstance(value, list):
             raise ValueError("ts_edges must be a list")
         self._ts_edges = value
+        self._ts_edges_version += 1
+
+    @property
+    def ts_edges_version(self):
+        return self._ts_edges_version
 
     # Getter và Setter cho ts_nodes
     @property
@@ -1342,6 +1349,7 @@ class GraphProcessor:
         self.create_set_of_edges(new_a)
         assert len(self.ts_edges) == len(self.tsedges), f"Thiếu cạnh ở đâu đó rồi {len(self.ts_edges)} != {len(self.tsedges)}"
         self.ts_edges.sort(key=lambda edge: (edge[0], edge[1]))
+        self._ts_edges_version += 1
         
     def insert_halting_edges(self):
         halting_nodes = set()
@@ -1387,15 +1395,16 @@ class GraphProcessor:
         M = max(target.id for target in self.get_targets())
         with open('TSG.txt', 'w') as file:
             file.write(f"p min {M} {len(self.ts_edges)}\n")
-            for node in self.ts_nodes:
+            # Demand của các nút ảo ràng buộc, tra một lần cho toàn bộ ts_nodes
+            virtual_demands = [0] * len(self.ts_nodes)
+            if self.restriction_controller and hasattr(self.restriction_controller, 'apply_demands'):
+                virtual_demands = self.restriction_controller.apply_demands([node.id for node in self.ts_nodes]).tolist()
+            elif self.restriction_controller and hasattr(self.restriction_controller, 'get_virtual_node_demand'):
+                virtual_demands = [self.restriction_controller.get_virtual_node_demand(node.id) for node in self.ts_nodes]
+            for node, virtual_demand in zip(self.ts_nodes, virtual_demands):
                 if isinstance(node, (ArtificialNode)):
                     file.write(f"c Node {node.id} is ArtificialNode\n")
                 
-                # Check if this is a virtual restriction node with specific demand
-                virtual_demand = 0
-                if self.restriction_controller and hasattr(self.restriction_controller, 'get_virtual_node_demand'):
-                    virtual_demand = self.restriction_controller.get_virtual_node_demand(node.id)
-                
                 # Calculate demand: virtual nodes have their specific demand, others follow original logic
                 if virtual_demand != 0:
                     demand = virtual_demand
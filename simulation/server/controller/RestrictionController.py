@@ -4,6 +4,8 @@ from collections import defaultdict
 from abc import ABC, abstractmethod # Import ABC and abstractmethod
 
 class RestrictionController(ABC): # Inherit from ABC
+    __slots__ = ('restriction_edges_store', 'alpha', 'beta', 'gamma', '_H', 'ur', '_M', '_graph_processor')
+
     def __init__(self, graph_processor):
         self.restriction_edges_store = defaultdict(list) # Renamed to avoid conflict if subclass has self.restrictions
         self.alpha = graph_processor.alpha
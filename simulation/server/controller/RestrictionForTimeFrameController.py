@@ -4,11 +4,53 @@ from model.Graph import Graph
 from typing import List, Tuple, Set, Optional, Dict
 import numpy as np
 import networkx as nx
+from networkx.algorithms.flow import preflow_push
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_flow
 import config
 from controller.RestrictionController import RestrictionController
 from gamma_analysis.integrated_gamma_control import GammaControlIntegrator
 
+# Optional JIT for the ts_edges scanning kernels
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Largest capacity scipy's maximum_flow accepts
+_INT32_MAX = np.iinfo(np.int32).max
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _boundary_edge_masks(source, dest, is_restricted):
+        """(incoming, outgoing): edges entering / leaving the restricted node set."""
+        incoming = np.zeros(source.shape[0], dtype=np.bool_)
+        outgoing = np.zeros(source.shape[0], dtype=np.bool_)
+        for i in prange(source.shape[0]):
+            source_restricted = is_restricted[source[i]]
+            dest_restricted = is_restricted[dest[i]]
+            incoming[i] = dest_restricted and not source_restricted
+            outgoing[i] = source_restricted and not dest_restricted
+        return incoming, outgoing
+else:
+    def _boundary_edge_masks(source, dest, is_restricted):
+        """(incoming, outgoing): edges entering / leaving the restricted node set."""
+        source_restricted = is_restricted[source]
+        dest_restricted = is_restricted[dest]
+        return dest_restricted & ~source_restricted, source_restricted & ~dest_restricted
+
 class RestrictionForTimeFrameController(RestrictionController):
+    # Mọi thuộc tính instance phải được khai báo ở đây (lớp cha cũng dùng __slots__, nên không có __dict__)
+    __slots__ = (
+        'restrictions', '_min_gamma', '_demands', '_omega',
+        '_all_additional_edges', '_all_additional_nodes',
+        'gamma_integrator', 'last_escape_edges', 'last_violations',
+        '_virtual_node_demand_map', '_demand', '_demand_mask',
+        '_edges_np', '_edges_np_key',
+        '_flow_graph', '_flow_graph_edges',
+    )
+
     def __init__(self, graph_processor):
         super().__init__(graph_processor)
         self.restrictions: List[Tuple[List[List[int]], List[int], int, float, Optional[float], float]] = []
@@ -28,7 +70,19 @@ class RestrictionForTimeFrameController(RestrictionController):
         # --- VIRTUAL FLOW MAPPING ---
         # Map virtual node IDs to their virtual flow values
         # Format: {vS_global_id: virtual_flow_needed, vD_global_id: -virtual_flow_needed}
+        # Mirrored into _demand / _demand_mask (indexed by global node id) by the property setter
         self._virtual_node_demands = {}
+        
+        # --- RESTRICTED EDGE LOOKUP ---
+        # Column arrays over ts_edges (spatial edge key, t1, t2 per position), plus the
+        # (list identity, length, GraphProcessor.ts_edges_version) they were built for
+        self._edges_np = None
+        self._edges_np_key = None
+        
+        # --- MAX FLOW GRAPH ---
+        # Reused across calculate_max_flow calls; _flow_graph_edges mirrors its edges as (u, v) -> capacity
+        self._flow_graph = None
+        self._flow_graph_edges = {}
 
     # --- MERGED FROM max_flow ---
     def get_all_additional_nodes(self) -> Set[int]:
@@ -100,16 +154,18 @@ class RestrictionForTimeFrameController(RestrictionController):
                 print(f"[DEBUG] Removed {removed_tsedges} edges from tsedges")
 
         # Khôi phục các cung gốc đã bị xóa
-        original_edges_to_re_add = {
-            edge for edge in self._omega
-            if any((e[0], e[1]) in additional_edges_set for e in self.get_all_additional_edges()) # Heuristic to find which omega was processed
-        }
+        # Heuristic to find which omega was processed; the test does not depend on the omega
+        # edge, so it is evaluated once instead of per edge
+        omega_was_processed = any((e[0], e[1]) in additional_edges_set for e in self.get_all_additional_edges())
+        original_edges_to_re_add = set(self._omega) if omega_was_processed else set()
         if original_edges_to_re_add:
             print(f"[DEBUG] Re-adding {len(original_edges_to_re_add)} original omega edges")
             self._graph_processor.ts_edges.extend(list(original_edges_to_re_add))
             self._graph_processor.create_set_of_edges(original_edges_to_re_add)
 
         # Reset lại trạng thái
+        self._invalidate_edge_arrays()
+        self._reset_flow_graph()
         self.set_all_additional_nodes(set())
         self.set_all_additional_edges([])
         self._omega = []
@@ -312,6 +368,47 @@ class RestrictionForTimeFrameController(RestrictionController):
 
         return list(components.values())
 
+    def _invalidate_edge_arrays(self) -> None:
+        self._edges_np = None
+        self._edges_np_key = None
+
+    def _spatial_edge_key(self, s_source, s_dest):
+        # Spatial coordinates are 1..M, so (s_source, s_dest) <-> s_source*(M+1) + s_dest
+        return s_source * (self._M + 1) + s_dest
+
+    def _ts_edge_arrays(self) -> Dict[str, np.ndarray]:
+        # Decode every ts_edge once into columns; reuse them while ts_edges is unchanged
+        ts_edges = self._graph_processor.ts_edges
+        # Replacing the list, appending/extending and GraphProcessor's in-place sort (which bumps
+        # ts_edges_version) all change this key; other edits must call _invalidate_edge_arrays
+        edges_key = (id(ts_edges), len(ts_edges), getattr(self._graph_processor, 'ts_edges_version', 0))
+        if self._edges_np is None or edges_key != self._edges_np_key:
+            ids = np.array([(edge[0], edge[1]) for edge in ts_edges], dtype=np.int64).reshape(-1, 2)
+            # Same as _get_node_time / _get_node_coordinates, for all ids at once, so no
+            # lookup has to divide again
+            times = ((ids - 1) // self._M).astype(np.int32)
+            coords = ((ids - 1) % self._M + 1).astype(np.int32)
+            spatial = self._spatial_edge_key(coords[:, 0].astype(np.int64), coords[:, 1])
+            # Positions sorted by spatial key (stable, so ts_edges order within a key): the edges
+            # of one spatial edge are a contiguous window found by binary search
+            spatial_order = np.argsort(spatial, kind='stable')
+            self._edges_np = {
+                'source': ids[:, 0],
+                'dest': ids[:, 1],
+                'capacity': np.array([edge[3] for edge in ts_edges]),
+                'spatial': spatial,
+                'spatial_order': spatial_order,
+                'spatial_sorted': spatial[spatial_order],
+                's_source': coords[:, 0],
+                's_dest': coords[:, 1],
+                't1': times[:, 0],
+                't2': times[:, 1],
+                'max_node': int(ids.max(initial=0)),
+            }
+            self._edges_np_key = edges_key
+            print(f"[DEBUG] Built ts_edges arrays: {len(ts_edges)} edges")
+        return self._edges_np
+
     def identify_restricted_edges(self, restriction_edges, start_time_frame, end_time_frame):
         print(f"[DEBUG] identify_restricted_edges: restriction_edges={restriction_edges}, timeframe=[{start_time_frame}, {end_time_frame}]")
         
@@ -319,57 +416,86 @@ class RestrictionForTimeFrameController(RestrictionController):
         restriction_set = {(u, v) for u, v in restriction_edges}
         print(f"[DEBUG] restriction_set: {restriction_set}")
         
-        total_edges_checked = 0
-        matching_edges = 0
-        
-        for edge_tuple in self._graph_processor.ts_edges:
-            total_edges_checked += 1
-            source_id, dest_id, _, capacity, cost = edge_tuple
-            t1 = self._get_node_time(source_id)
-            t2 = self._get_node_time(dest_id)
-            s_source = self._get_node_coordinates(source_id)
-            s_dest = self._get_node_coordinates(dest_id)
-            base_edge = (s_source, s_dest)
-
-            if base_edge in restriction_set:
-                matching_edges += 1
-                time_intersects = (t1 < end_time_frame) and (t2 > start_time_frame)
-                print(f"[DEBUG] Edge ({source_id}, {dest_id}) -> base_edge={base_edge}, times=({t1}, {t2}), time_intersects={time_intersects}")
-                
-                if time_intersects:
-                    omega.append((source_id, dest_id, 0, capacity, cost))
-                    print(f"[DEBUG] Added to omega: ({source_id}, {dest_id}, 0, {capacity}, {cost})")
+        ts_edges = self._graph_processor.ts_edges
+        edges_np = self._ts_edge_arrays()
+        # Pairs outside 1..M are no spatial edge at all (and would alias another key)
+        restriction_keys = np.array([self._spatial_edge_key(u, v) for u, v in restriction_set
+                                     if 1 <= u <= self._M and 1 <= v <= self._M], dtype=np.int64)
+        # Window of each restriction key in the sorted keys, then back to ts_edges order
+        window_starts = np.searchsorted(edges_np['spatial_sorted'], restriction_keys, side='left')
+        window_ends = np.searchsorted(edges_np['spatial_sorted'], restriction_keys, side='right')
+        matching_positions = np.sort(np.concatenate(
+            [edges_np['spatial_order'][start:end] for start, end in zip(window_starts.tolist(), window_ends.tolist())]
+            + [np.empty(0, dtype=np.int64)]))
+        # Which of the spatially matching edges overlap the timeframe
+        t1s = edges_np['t1'][matching_positions]
+        t2s = edges_np['t2'][matching_positions]
+        time_intersects_all = (t1s < end_time_frame) & (t2s > start_time_frame)
+        base_edges = zip(edges_np['s_source'][matching_positions].tolist(), edges_np['s_dest'][matching_positions].tolist())
+        
+        for position, base_edge, t1, t2, time_intersects in zip(matching_positions.tolist(), base_edges, t1s.tolist(),
+                                                                t2s.tolist(), time_intersects_all.tolist()):
+            source_id, dest_id, _, capacity, cost = ts_edges[position]
+            print(f"[DEBUG] Edge ({source_id}, {dest_id}) -> base_edge={base_edge}, times=({t1}, {t2}), time_intersects={time_intersects}")
+            
+            if time_intersects:
+                omega.append((source_id, dest_id, 0, capacity, cost))
+                print(f"[DEBUG] Added to omega: ({source_id}, {dest_id}, 0, {capacity}, {cost})")
         
-        print(f"[DEBUG] identify_restricted_edges result: checked {total_edges_checked} edges, found {matching_edges} matching edges, omega size: {len(omega)}")
+        print(f"[DEBUG] identify_restricted_edges result: checked {len(ts_edges)} edges, found {len(matching_positions)} matching edges, omega size: {len(omega)}")
         return omega
     
     def identify_restricted_nodes(self, omega: List[Tuple[int, int, int, int, int]]) -> set:
         # Identify restricted nodes in omega
         print(f"[DEBUG] identify_restricted_nodes: omega size = {len(omega)}")
         
-        restricted_nodes = set()
-        for source_id, dest_id, _, _, _ in omega:
-            restricted_nodes.add(source_id)
-            restricted_nodes.add(dest_id)
-            print(f"[DEBUG] Processing edge ({source_id}, {dest_id})")
+        if not omega:
+            restricted_nodes = set()
+        else:
+            # Endpoints of every omega edge, deduplicated in one call
+            edge_ids = np.array([(edge[0], edge[1]) for edge in omega], dtype=np.int64)
+            restricted_nodes = set(np.unique(edge_ids).tolist())
         
         print(f"[DEBUG] identify_restricted_nodes result: {len(restricted_nodes)} nodes = {sorted(restricted_nodes)}")
         return restricted_nodes
         
+    def _edge_columns(self, TSG) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        # Source, dest and capacity columns of TSG and its largest node id; ts_edges reuses its cached arrays
+        if TSG is self._graph_processor.ts_edges:
+            edges_np = self._ts_edge_arrays()
+            return edges_np['source'], edges_np['dest'], edges_np['capacity'], edges_np['max_node']
+        ids = np.array([(edge[0], edge[1]) for edge in TSG], dtype=np.int64).reshape(-1, 2)
+        return ids[:, 0], ids[:, 1], np.array([edge[3] for edge in TSG]), int(ids.max(initial=0))
+
+    def _sum_capacity_by_node(self, node_ids: np.ndarray, capacity: np.ndarray, max_node: int) -> defaultdict:
+        # Total capacity per node, accumulated into a dense per-id array (no sort); keyed by node id
+        totals = np.bincount(node_ids, weights=capacity, minlength=max_node + 1).astype(capacity.dtype)
+        # Nodes whose edges all have capacity 0 still get an entry, as a loop over TSG would give them
+        has_edge = np.zeros(max_node + 1, dtype=bool)
+        has_edge[node_ids] = True
+        nodes = np.flatnonzero(has_edge)
+        return defaultdict(int, zip(nodes.tolist(), totals[nodes].tolist()))
+
+    def _capacity_maps(self, TSG: List[Tuple[int, int, int, int, int]], restricted_nodes) -> Tuple[defaultdict, defaultdict]:
+        # Incoming and outgoing capacity of restricted nodes across the omega boundary, in one pass over TSG
+        source, dest, capacity, max_node = self._edge_columns(TSG)
+        # Only integer IDs can match a node (update_gamma_dynamically passes omega edges here)
+        # One membership structure, whatever collection the caller passed (duplicates collapse here)
+        restricted = frozenset(restricted_nodes)
+        restricted_ids = np.fromiter((node for node in restricted if isinstance(node, (int, np.integer))), dtype=np.int64)
+        is_restricted = np.zeros(max(max_node, int(restricted_ids.max(initial=0))) + 1, dtype=bool)
+        is_restricted[restricted_ids] = True
+        incoming_edges, outgoing_edges = _boundary_edge_masks(source, dest, is_restricted)
+        print(f"[DEBUG] _capacity_maps: found {int(incoming_edges.sum())} incoming edges, {int(outgoing_edges.sum())} outgoing edges")
+        return (self._sum_capacity_by_node(dest[incoming_edges], capacity[incoming_edges], max_node),
+                self._sum_capacity_by_node(source[outgoing_edges], capacity[outgoing_edges], max_node))
+
     def calculate_incoming_capacity_for_restricted_nodes(self, TSG: List[Tuple[int, int, int, int, int]] , restricted_nodes) -> defaultdict:
         # Identify restricted nodes in omega with edges come from nodes not in omega and their capacities
         print(f"[DEBUG] calculate_incoming_capacity: restricted_nodes={sorted(restricted_nodes)}, TSG size={len(TSG)}")
         
-        restricted_nodes_incoming_capacity = defaultdict(int)
-        incoming_edges_found = 0
-        
-        for source_id, dest_id, _, capacity, _ in TSG:
-            if dest_id in restricted_nodes  and source_id not in restricted_nodes:
-                restricted_nodes_incoming_capacity[dest_id] += capacity
-                incoming_edges_found += 1
-                print(f"[DEBUG] Incoming edge: ({source_id}, {dest_id}) capacity={capacity}")
+        restricted_nodes_incoming_capacity, _ = self._capacity_maps(TSG, restricted_nodes)
         
-        print(f"[DEBUG] calculate_incoming_capacity result: found {incoming_edges_found} incoming edges")
         for node_id, capacity in restricted_nodes_incoming_capacity.items():
             print(f"[DEBUG] Node {node_id} total incoming capacity: {capacity}")
         
@@ -379,66 +505,112 @@ class RestrictionForTimeFrameController(RestrictionController):
         # Identify restricted nodes in omega with edges go to nodes not in omega and their capacities
         print(f"[DEBUG] calculate_outgoing_capacity: restricted_nodes={sorted(restricted_nodes)}, TSG size={len(TSG)}")
         
-        restricted_nodes_outgoing_capacity = defaultdict(int)
-        outgoing_edges_found = 0
+        _, restricted_nodes_outgoing_capacity = self._capacity_maps(TSG, restricted_nodes)
         
-        for source_id, dest_id, _, capacity, _ in TSG:
-            if source_id in restricted_nodes and dest_id not in restricted_nodes:
-                restricted_nodes_outgoing_capacity[source_id] += capacity
-                outgoing_edges_found += 1
-                print(f"[DEBUG] Outgoing edge: ({source_id}, {dest_id}) capacity={capacity}")
-                
-        print(f"[DEBUG] calculate_outgoing_capacity result: found {outgoing_edges_found} outgoing edges")
         for node_id, capacity in restricted_nodes_outgoing_capacity.items():
             print(f"[DEBUG] Node {node_id} total outgoing capacity: {capacity}")
         
         return restricted_nodes_outgoing_capacity
     
-    def calculate_max_flow(self , omega: List[Tuple[int, int, int, int, int]] , restricted_nodes_incoming_capacity , restricted_nodes_outgoing_capacity) -> int:
-        # Calculate max flow F
+    def _max_flow_networkx(self, flow_edges: Dict[Tuple, int]) -> int:
+        # Update the graph from the previous call by the difference only
+        G = self._flow_graph
+        if G is None:
+            G = self._flow_graph = nx.DiGraph()
+            # Ensure virtual source and sink nodes exist in the graph
+            G.add_nodes_from(["vS", "vT"])
+            print(f"[DEBUG] Added virtual source 'vS' and sink 'vT' nodes")
+        stale_edges = self._flow_graph_edges.keys() - flow_edges.keys()
+        changed_edges = [(u, v, {"capacity": capacity}) for (u, v), capacity in flow_edges.items()
+                         if self._flow_graph_edges.get((u, v)) != capacity]
+        G.remove_edges_from(stale_edges)
+        # Drop nodes left without edges, so the graph is what a fresh build would be
+        G.remove_nodes_from([node for edge in stale_edges for node in edge
+                             if node not in ("vS", "vT") and node in G and G.degree(node) == 0])
+        G.add_edges_from(changed_edges)
+        self._flow_graph_edges = flow_edges
+        print(f"[DEBUG] Max flow graph updated: removed {len(stale_edges)} edges, added/updated {len(changed_edges)} edges")
+        
+        return nx.maximum_flow_value(G, "vS", "vT", flow_func=preflow_push)
+
+    def _max_flow_scipy(self, flow_edges: Dict[Tuple, int]) -> Optional[int]:
+        # scipy's maximum_flow needs int32 capacities; anything else is left to NetworkX (None)
+        capacities = list(flow_edges.values())
+        if not all(isinstance(capacity, (int, np.integer)) and 0 <= capacity <= _INT32_MAX for capacity in capacities):
+            return None
+        # Compact node indices: vS = 0, vT = 1, then nodes in order of first appearance
+        index = {"vS": 0, "vT": 1}
+        rows = [index.setdefault(u, len(index)) for u, _ in flow_edges]
+        cols = [index.setdefault(v, len(index)) for _, v in flow_edges]
+        n = len(index)
+        capacity_matrix = csr_matrix((np.array(capacities, dtype=np.int32), (rows, cols)), shape=(n, n))
+        return int(maximum_flow(capacity_matrix, 0, 1).flow_value)
+
+    def calculate_max_flow(self , omega: List[Tuple[int, int, int, int, int]] , restricted_nodes_incoming_capacity , restricted_nodes_outgoing_capacity, use_scipy: bool = True, flow_limit=None) -> int:
+        # Calculate max flow F. With flow_limit, a flow that cannot exceed flow_limit may be
+        # reported as its capacity bound instead of its exact value
         print(f"[DEBUG] calculate_max_flow: omega size={len(omega)}")
         print(f"[DEBUG] incoming capacity nodes: {len(restricted_nodes_incoming_capacity)}")
         print(f"[DEBUG] outgoing capacity nodes: {len(restricted_nodes_outgoing_capacity)}")
         
-        # Build graph
-        G = nx.DiGraph()
-        # Ensure virtual source and sink nodes exist in the graph
-        G.add_node("vS")
-        G.add_node("vT")
-        print(f"[DEBUG] Added virtual source 'vS' and sink 'vT' nodes")
-
-        # Add omega edges
-        omega_edges_added = 0
-        for source_id, dest_id, _, capacity, _ in omega:
-            G.add_edge(source_id, dest_id, capacity=capacity)
-            omega_edges_added += 1
-            print(f"[DEBUG] Added omega edge: ({source_id}, {dest_id}) capacity={capacity}")
-        
-        print(f"[DEBUG] Added {omega_edges_added} omega edges to max flow graph")
-            
-        # Add incoming edges for restricted nodes
-        incoming_edges_added = 0
-        for node_id, capacity in restricted_nodes_incoming_capacity.items():
-            G.add_edge("vS", node_id , capacity=capacity)
-            incoming_edges_added += 1
-            print(f"[DEBUG] Added incoming edge: (vS, {node_id}) capacity={capacity}")
+        # Everything leaves vS / enters vT through these edges, so their totals bound F
+        capacity_bound = min(sum(restricted_nodes_incoming_capacity.values()), sum(restricted_nodes_outgoing_capacity.values()))
+        if capacity_bound <= 0 or (flow_limit is not None and capacity_bound <= flow_limit):
+            print(f"[DEBUG] Maximum flow bounded by boundary capacity: {capacity_bound}, skipping max flow")
+            return max(capacity_bound, 0)
+        
+        # Edges this call needs: omega edges, vS -> restricted node, restricted node -> vT
+        flow_edges = {(source_id, dest_id): capacity for source_id, dest_id, _, capacity, _ in omega}
+        flow_edges.update((("vS", node_id), capacity) for node_id, capacity in restricted_nodes_incoming_capacity.items())
+        flow_edges.update(((node_id, "vT"), capacity) for node_id, capacity in restricted_nodes_outgoing_capacity.items())
+        
+        # Calculate max flow: scipy's C implementation, or NetworkX for non-integer capacities
+        max_flow_value = self._max_flow_scipy(flow_edges) if use_scipy else None
+        if max_flow_value is None:
+            max_flow_value = self._max_flow_networkx(flow_edges)
+        print(f"[DEBUG] Maximum flow calculated: {max_flow_value}")
         
-        print(f"[DEBUG] Added {incoming_edges_added} incoming edges from vS")
+        return max_flow_value
+
+    def _reset_flow_graph(self) -> None:
+        self._flow_graph = None
+        self._flow_graph_edges = {}
+
+    def _analyse_restriction(self, idx: int, restriction_item: tuple) -> Tuple[List[Tuple[int, int, int, int, int]], int, Optional[int]]:
+        # (omega, virtual_flow_needed, final_gamma) for one restriction; reads ts_edges, changes nothing
+        print(f"[DEBUG] Processing restriction {idx + 1}/{len(self.restrictions)}")
         
-        # Add outgoing edges for restricted nodes
-        outgoing_edges_added = 0
-        for node_id, capacity in restricted_nodes_outgoing_capacity.items():
-            G.add_edge(node_id, "vT", capacity=capacity)
-            outgoing_edges_added += 1
-            print(f"[DEBUG] Added outgoing edge: ({node_id}, vT) capacity={capacity}")
+        restriction_edges_config, start_time_frame, end_time_frame, U, priority, gamma_config, k_val = self.restriction_parser(restriction_item)
+        print(f"[DEBUG] Restriction {idx + 1}: timeframe=[{start_time_frame}, {end_time_frame}], U={U}, priority={priority}, gamma={gamma_config}, k={k_val}")
+        print(f"[DEBUG] Restriction {idx + 1}: edges_config={restriction_edges_config}")
         
-        print(f"[DEBUG] Added {outgoing_edges_added} outgoing edges to vT")
+        omega_for_this_restriction = self.identify_restricted_edges(restriction_edges_config, start_time_frame, end_time_frame)
+        if not omega_for_this_restriction:
+            print(f"[DEBUG] Restriction {idx + 1}: No omega edges found, skipping")
+            return omega_for_this_restriction, 0, None
         
-        # Calculate max flow
-        max_flow_value = nx.maximum_flow_value(G, "vS", "vT")
-        print(f"[DEBUG] Maximum flow calculated: {max_flow_value}")
+        print(f"[DEBUG] Restriction {idx + 1}: Found {len(omega_for_this_restriction)} omega edges")
+
+        current_restricted_nodes_set = self.identify_restricted_nodes(omega_for_this_restriction)
+        print(f"[DEBUG] Restriction {idx + 1}: Restricted nodes: {sorted(current_restricted_nodes_set)}")
         
-        return max_flow_value
+        # Both boundary capacity maps from one pass over ts_edges
+        incoming_capacity, outgoing_capacity = self._capacity_maps(self._graph_processor.ts_edges, current_restricted_nodes_set)
+        print(f"[DEBUG] Restriction {idx + 1}: incoming capacity={dict(incoming_capacity)}, outgoing capacity={dict(outgoing_capacity)}")
+        
+        flow_F_through_omega = self.calculate_max_flow(omega_for_this_restriction, incoming_capacity, outgoing_capacity, flow_limit=U)
+        # calculate_virtual_flow, inlined
+        virtual_flow_needed = flow_F_through_omega - U if flow_F_through_omega > U else 0
+        
+        print(f"[DEBUG] Restriction {idx + 1}: Max flow F={flow_F_through_omega}, U={U}, virtual_flow_needed={virtual_flow_needed}")
+
+        if virtual_flow_needed <= 0:
+            print(f"[DEBUG] Restriction {idx + 1}: No virtual flow needed, skipping")
+            return omega_for_this_restriction, virtual_flow_needed, None
+
+        final_gamma = int(round(gamma_config if gamma_config is not None else self.calculate_default_gamma(self._graph_processor.ts_edges, priority, k_val, self._min_gamma)))
+        print(f"[DEBUG] Restriction {idx + 1}: Final gamma={final_gamma}")
+        return omega_for_this_restriction, virtual_flow_needed, final_gamma
 
     def apply_restriction(self) -> None:
         print("[Restriction] Applying restrictions...")
@@ -450,44 +622,23 @@ class RestrictionForTimeFrameController(RestrictionController):
         if self._all_additional_nodes or self._all_additional_edges:
             self.remove_artificial_artifact()
 
+        # The graph only changes after the loop, so every restriction is analysed against the same ts_edges
+        analyses = [self._analyse_restriction(idx, restriction_item) for idx, restriction_item in enumerate(self.restrictions)]
+
         max_node_id_val = self._graph_processor.get_max_id()
         processed_restrictions = 0
+        virtual_node_demands = dict(self._virtual_node_demands)
 
-        for idx, restriction_item in enumerate(self.restrictions):
-            print(f"[DEBUG] Processing restriction {idx + 1}/{len(self.restrictions)}")
-            
-            restriction_edges_config, start_time_frame, end_time_frame, U, priority, gamma_config, k_val = self.restriction_parser(restriction_item)
-            print(f"[DEBUG] Restriction {idx + 1}: timeframe=[{start_time_frame}, {end_time_frame}], U={U}, priority={priority}, gamma={gamma_config}, k={k_val}")
-            print(f"[DEBUG] Restriction {idx + 1}: edges_config={restriction_edges_config}")
-            
-            omega_for_this_restriction = self.identify_restricted_edges(restriction_edges_config, start_time_frame, end_time_frame)
+        for idx, (restriction_item, (omega_for_this_restriction, virtual_flow_needed, final_gamma)) in enumerate(zip(self.restrictions, analyses)):
             if not omega_for_this_restriction:
-                print(f"[DEBUG] Restriction {idx + 1}: No omega edges found, skipping")
                 continue
             
-            print(f"[DEBUG] Restriction {idx + 1}: Found {len(omega_for_this_restriction)} omega edges")
-            
             # Lưu lại omega để có thể khôi phục cung gốc khi dọn dẹp
             self._omega.extend(omega_for_this_restriction)
 
-            current_restricted_nodes_set = self.identify_restricted_nodes(omega_for_this_restriction)
-            print(f"[DEBUG] Restriction {idx + 1}: Restricted nodes: {sorted(current_restricted_nodes_set)}")
-            
-            incoming_capacity = self.calculate_incoming_capacity_for_restricted_nodes(self._graph_processor.ts_edges, current_restricted_nodes_set)
-            outgoing_capacity = self.calculate_outgoing_capacity_for_restricted_nodes(self._graph_processor.ts_edges, current_restricted_nodes_set)
-            
-            flow_F_through_omega = self.calculate_max_flow(omega_for_this_restriction, incoming_capacity, outgoing_capacity)
-            virtual_flow_needed = self.calculate_virtual_flow(flow_F_through_omega, U)
-            
-            print(f"[DEBUG] Restriction {idx + 1}: Max flow F={flow_F_through_omega}, U={U}, virtual_flow_needed={virtual_flow_needed}")
-
             if virtual_flow_needed <= 0:
-                print(f"[DEBUG] Restriction {idx + 1}: No virtual flow needed, skipping")
                 continue
 
-            final_gamma = int(round(gamma_config if gamma_config is not None else self.calculate_default_gamma(self._graph_processor.ts_edges, priority, k_val, self._min_gamma)))
-            print(f"[DEBUG] Restriction {idx + 1}: Final gamma={final_gamma}")
-            
             # Tạo nút ảo toàn cục cho ràng buộc này
             max_node_id_val += 1
             vS_global_id = max_node_id_val
@@ -500,8 +651,8 @@ class RestrictionForTimeFrameController(RestrictionController):
             print(f"[DEBUG] Restriction {idx + 1}: Created global nodes vS={vS_global_id}, vD={vD_global_id}")
             
             # Track virtual flow demands for these nodes
-            self._virtual_node_demands[vS_global_id] = virtual_flow_needed
-            self._virtual_node_demands[vD_global_id] = -virtual_flow_needed
+            virtual_node_demands[vS_global_id] = virtual_flow_needed
+            virtual_node_demands[vD_global_id] = -virtual_flow_needed
             print(f"[DEBUG] Restriction {idx + 1}: Virtual demands - vS({vS_global_id})={virtual_flow_needed}, vD({vD_global_id})={-virtual_flow_needed}")
             
             # Thêm và theo dõi các nút ảo toàn cục
@@ -552,6 +703,8 @@ class RestrictionForTimeFrameController(RestrictionController):
             processed_restrictions += 1
             print(f"[DEBUG] Restriction {idx + 1}: Processing completed")
             
+        self._virtual_node_demands = virtual_node_demands
+
         print(f"[DEBUG] Total restrictions processed: {processed_restrictions}")
         print(f"[DEBUG] Total additional nodes created: {len(self._all_additional_nodes)}")
         print(f"[DEBUG] Total additional edges created: {len(self._all_additional_edges)}")
@@ -580,6 +733,7 @@ class RestrictionForTimeFrameController(RestrictionController):
             
             self._graph_processor.ts_edges.extend(self.get_all_additional_edges())
             self._graph_processor.create_set_of_edges(self.get_all_additional_edges())
+            self._invalidate_edge_arrays()
             print(f"[DEBUG] Added {len(self.get_all_additional_edges())} additional edges, graph now has {len(self._graph_processor.ts_edges)} edges:")
             
             # Debug: Print some escape edges
@@ -609,7 +763,7 @@ class RestrictionForTimeFrameController(RestrictionController):
             # Calculate current flow and virtual flow needed
             incoming_capacity = self.calculate_incoming_capacity_for_restricted_nodes(self._graph_processor.ts_edges, omega_for_this_restriction)
             outgoing_capacity = self.calculate_outgoing_capacity_for_restricted_nodes(self._graph_processor.ts_edges, omega_for_this_restriction)
-            flow_F_through_omega = self.calculate_max_flow(omega_for_this_restriction, incoming_capacity, outgoing_capacity)
+            flow_F_through_omega = self.calculate_max_flow(omega_for_this_restriction, incoming_capacity, outgoing_capacity, flow_limit=U)
             virtual_flow_needed = self.calculate_virtual_flow(flow_F_through_omega, U)
 
             # Determine if there are violations
@@ -774,6 +928,22 @@ class RestrictionForTimeFrameController(RestrictionController):
         for idx, restriction_item in enumerate(self.restrictions):
             self._print_restriction_info(idx, restriction_item)
     
+    @property
+    def _virtual_node_demands(self) -> Dict[int, int]:
+        return self._virtual_node_demand_map
+
+    @_virtual_node_demands.setter
+    def _virtual_node_demands(self, demands: Dict[int, int]) -> None:
+        # Dict gốc vẫn được giữ cho get_virtual_node_demands; tra cứu theo id dùng mảng
+        self._virtual_node_demand_map = demands
+        node_ids = np.fromiter(demands.keys(), dtype=np.int64, count=len(demands))
+        values = np.array(list(demands.values()))
+        size = int(node_ids.max()) + 1 if node_ids.size else 0
+        self._demand = np.zeros(size, dtype=values.dtype if values.size else np.int64)
+        self._demand_mask = np.zeros(size, dtype=bool)
+        self._demand[node_ids] = values
+        self._demand_mask[node_ids] = True
+
     def get_virtual_node_demands(self) -> Dict[int, int]:
         """
         Get mapping of virtual node IDs to their demand values.
@@ -786,4 +956,17 @@ class RestrictionForTimeFrameController(RestrictionController):
         Get demand value for a specific virtual node.
         Returns: demand value, or 0 if node is not a virtual restriction node
         """
-        return self._virtual_node_demands.get(node_id, 0)
\ No newline at end of file
+        if 0 <= node_id < self._demand_mask.size and self._demand_mask[node_id]:
+            return self._demand[node_id].item()
+        return 0
+
+    def apply_demands(self, node_ids) -> np.ndarray:
+        """
+        Vectorized get_virtual_node_demand: demand for each id in node_ids (0 for non-virtual nodes).
+        """
+        ids = np.asarray(node_ids, dtype=np.int64)
+        demands = np.zeros(ids.shape, dtype=self._demand.dtype)
+        in_range = (ids >= 0) & (ids < self._demand_mask.size)
+        ids_in_range = ids[in_range]
+        demands[in_range] = np.where(self._demand_mask[ids_in_range], self._demand[ids_in_range], 0)
+        return demands
\ No newline at end of file
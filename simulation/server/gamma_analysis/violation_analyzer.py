@@ -17,9 +17,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from integrated_gamma_control import GammaControlIntegrator
 
+# Example: "c Edge (2,5) violates restriction 1 with n=2"
+_VIOLATION_EDGE_RE = re.compile(r'Edge \((\d+),(\d+)\) violates')
+_VIOLATION_COUNT_RE = re.compile(r'n=(\d+)')
+_RESTRICTION_ID_RE = re.compile(r'restriction (\d+)')
+
 class ViolationAnalyzer:
-    def __init__(self, tsg_file: str = "TSG.txt"):
+    def __init__(self, tsg_file: str = "TSG.txt", quiet: bool = False):
         self.tsg_file = tsg_file
+        # Quiet mode skips the human-readable summaries; use get_violation_summary() instead
+        self.quiet = quiet
         self.violations = []
         self.edges = []
         self.nodes = []
@@ -42,7 +49,7 @@ class ViolationAnalyzer:
                 for line_num, line in enumerate(file, 1):
                     line = line.strip()
                     
-                    if line.startswith('c Edge') and 'violates' in line:
+                    if line.startswith('c Edge'):
                         violation = self.parse_violation_line(line, line_num)
                         if violation:
                             self.violations.append(violation)
@@ -63,12 +70,17 @@ class ViolationAnalyzer:
             print(f"❌ Error parsing TSG file: {e}")
             return False
     
+    @property
+    def total_violation_count(self) -> int:
+        """Total violation count (n) over the parsed violations."""
+        return sum(v['violation_count'] for v in self.violations)
+    
     def parse_violation_line(self, line: str, line_num: int) -> Dict:
         """Parse a violation comment line."""
         # Example: "c Edge (2,5) violates restriction 1 with n=2"
         try:
             # Extract source and destination
-            match = re.search(r'Edge \((\d+),(\d+)\)', line)
+            match = _VIOLATION_EDGE_RE.search(line)
             if not match:
                 return None
                 
@@ -76,11 +88,11 @@ class ViolationAnalyzer:
             dest = int(match.group(2))
             
             # Extract violation count
-            n_match = re.search(r'n=(\d+)', line)
+            n_match = _VIOLATION_COUNT_RE.search(line)
             violation_count = int(n_match.group(1)) if n_match else 1
             
             # Extract restriction number
-            restr_match = re.search(r'restriction (\d+)', line)
+            restr_match = _RESTRICTION_ID_RE.search(line)
             restriction_id = int(restr_match.group(1)) if restr_match else None
             
             return {
@@ -131,6 +143,8 @@ class ViolationAnalyzer:
     
     def analyze_violations(self):
         """Analyze the violations found."""
+        if self.quiet:
+            return
         if not self.violations:
             print("✅ No violations found!")
             return
@@ -152,8 +166,7 @@ class ViolationAnalyzer:
             print(f"  Restriction {rid}: {len(violations)} violations")
         
         # Sum total violation count
-        total_violation_count = sum(v['violation_count'] for v in self.violations)
-        print(f"\nTotal violation count (n): {total_violation_count}")
+        print(f"\nTotal violation count (n): {self.total_violation_count}")
         
         # Show details
         print(f"\nDetailed violations:")
@@ -168,13 +181,15 @@ class ViolationAnalyzer:
         """Get a summary of violations for experiments."""
         return {
             'total_violations': len(self.violations),
-            'total_violation_count': sum(v['violation_count'] for v in self.violations),
+            'total_violation_count': self.total_violation_count,
             'violated_edges': [(v['source'], v['dest']) for v in self.violations],
             'restrictions_violated': list(set(v['restriction_id'] for v in self.violations if v['restriction_id'] is not None))
         }
     
     def print_graph_summary(self):
         """Print a summary of the graph structure."""
+        if self.quiet:
+            return
         print(f"\n📊 GRAPH SUMMARY")
         print(f"{'='*30}")
         print(f"Nodes: {len(self.nodes)}")
@@ -251,7 +266,7 @@ def main():
             print(f"\n📄 Analyzing {tsg_file}")
             print("-" * 30)
             
-            analyzer = ViolationAnalyzer(tsg_file)
+            analyzer = ViolationAnalyzer(tsg_file, quiet=not sys.stdout.isatty())
             if analyzer.parse_tsg_file():
                 analyzer.print_graph_summary()
                 analyzer.analyze_violations()
@@ -24,6 +24,7 @@ Provides detailed analysis of gamma penalty effects on specific escape edges.
     --real                  Run with real simulation integration
     --output-dir DIR        Output directory (default: output)
     --experiment-name NAME  Name for this experiment
+    --quiet                 Only print summaries, not per-gamma progress
     --help                  Show detailed help
     
 💡 USAGE EXAMPLES:
@@ -35,32 +36,45 @@ Provides detailed analysis of gamma penalty effects on specific escape edges.
     
     # Analyze custom DIMACS file
     python master_gamma_analysis.py --dimacs-file my_tsg.txt --escape-edge 75 80
+
+🐍 PYTHON API (no argparse):
+    from master_gamma_analysis import run_analysis
+    run_analysis(escape_edge=(81, 82), gamma_values=[1, 10, 50, 100], real=True)
 """
 
 import os
+import io
+import errno
+import mmap
 import sys
 import argparse
 import json
 import time
-import shutil
 import re
 import numpy as np
 import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional, Any
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+from typing import List, Dict, Tuple, Optional, Any, Iterable, Iterator
 import warnings
 warnings.filterwarnings('ignore')
 
-# Import plotting libraries
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
-import seaborn as sns
+
+# Optional JIT for the violation aggregation kernel
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional multithreaded CSV parser for the DIMACS arc table
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Add parent directory for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -71,7 +85,7 @@ try:
     from controller.RestrictionForTimeFrameController import RestrictionForTimeFrameController
     from model.Graph import Graph
     from model.Event import Event
-    from model.NXSolution import NetworkXSolution
+    from model.NXSolution import NetworkXSolution, FlowProblem, MCFSIMPLEX_AVAILABLE, ORTOOLS_AVAILABLE
     REAL_SIMULATION_AVAILABLE = True
 except ImportError as e:
     # Real simulation modules not available, use demo mode
@@ -79,13 +93,233 @@ except ImportError as e:
     print(f"⚠️  Real simulation modules not available: {e}")
     print("🎭 Demo mode will be used instead")
 
+DIMACS_ARC_COLUMNS = ['source', 'dest', 'lower_bound', 'capacity', 'cost']
+
+# 'a src dst lb cap cost' arc line, matched on the raw mmap bytes
+_A_RE = re.compile(rb'a\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)')
+
+# The same arc line found anywhere in a whole-file buffer (fields never span lines)
+_A_LINE_RE = re.compile(rb'^a[ \t]+(\d+)[ \t]+(\d+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)', re.MULTILINE)
+
+def _iter_mmap_lines(mm: mmap.mmap) -> Iterator[bytes]:
+    """Yield the lines of a mapped file without touching its shared file position."""
+    start, end = 0, len(mm)
+    while start < end:
+        stop = mm.find(b'\n', start)
+        stop = end if stop < 0 else stop + 1
+        yield mm[start:stop]
+        start = stop
+
+def _parse_dimacs_arcs(lines: Iterable[bytes]) -> pd.DataFrame:
+    """
+    Parse all 'a' (arc) lines of a DIMACS file, given as raw byte lines, into a DataFrame.
+    
+    Columns: source, dest, lower_bound, capacity, cost (int64), plus the
+    1-based line_num and raw_line of each arc for reporting.
+    """
+    line_nums = []
+    raw_lines = []
+    arc_lines = []
+    
+    # Only arc lines are ever decoded
+    for num, line in enumerate(lines, 1):
+        if line.startswith(b'a '):
+            # Arc lines with fewer than 6 fields are ignored, as in the line-by-line parser
+            match = _A_RE.match(line)
+            if match:
+                line_nums.append(num)
+                raw_lines.append(line.strip())
+                arc_lines.append(b' '.join(match.groups()))
+    
+    if not arc_lines:
+        arcs = pd.DataFrame({col: np.empty(0, dtype=np.int64) for col in DIMACS_ARC_COLUMNS})
+    else:
+        # Fields are re-joined with single spaces so both engines can use a literal separator
+        arcs = pd.read_csv(io.BytesIO(b'\n'.join(arc_lines)), sep=' ', header=None,
+                           names=DIMACS_ARC_COLUMNS, dtype=np.int64,
+                           engine='pyarrow' if PYARROW_AVAILABLE else 'c')
+    arcs['line_num'] = line_nums
+    arcs['raw_line'] = [line.decode() for line in raw_lines]
+    return arcs
+
+_COPY_BUFSIZE = 256 * 1024
+_KERNEL_COPY_UNSUPPORTED = (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP)
+
+def _buffered_copy(in_fd: int, out_fd: int, bufsize: int = _COPY_BUFSIZE):
+    """Copy the rest of in_fd to out_fd through one reused 256 KiB buffer."""
+    with memoryview(bytearray(bufsize)) as buf:
+        while True:
+            n = os.readv(in_fd, [buf])
+            if n == 0:
+                break
+            view = buf[:n]
+            while view:
+                view = view[os.write(out_fd, view):]
+
+def _kernel_copy(src: str, dst: str):
+    """
+    Copy the bytes of src to dst without bouncing them through user space:
+    copy_file_range where the kernel supports it, sendfile otherwise, and reads
+    into one reused buffer as the last resort. Metadata is not carried over.
+    """
+    in_fd = os.open(src, os.O_RDONLY)
+    try:
+        out_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            remaining = os.fstat(in_fd).st_size
+            use_copy_file_range = hasattr(os, 'copy_file_range')
+            use_sendfile = hasattr(os, 'sendfile')
+            while remaining > 0 and (use_copy_file_range or use_sendfile):
+                try:
+                    if use_copy_file_range:
+                        copied = os.copy_file_range(in_fd, out_fd, remaining)
+                    else:
+                        copied = os.sendfile(out_fd, in_fd, None, remaining)
+                except OSError as e:
+                    if e.errno not in _KERNEL_COPY_UNSUPPORTED:
+                        raise
+                    # Not supported for this kernel/filesystem pair; step down a method
+                    if use_copy_file_range:
+                        use_copy_file_range = False
+                    else:
+                        use_sendfile = False
+                    continue
+                if copied == 0:
+                    break
+                remaining -= copied
+            if remaining > 0:
+                _buffered_copy(in_fd, out_fd)
+        finally:
+            os.close(out_fd)
+    finally:
+        os.close(in_fd)
+
+def _flow_dict_to_frame(flow_dict: Dict) -> pd.DataFrame:
+    """Flatten a NetworkX {source: {dest: flow}} dict into int source/dest/flow columns."""
+    records = [(int(u), int(v), f) for u, targets in flow_dict.items() for v, f in targets.items()]
+    return pd.DataFrame(records, columns=['source', 'dest', 'flow']).astype(np.int64)
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _aggregate_violations(flows, costs):
+        """Return (violations_count, total_violation_flow, total_penalty_cost) over escape edges."""
+        violations_count = 0
+        total_flow = 0
+        total_penalty = 0
+        for i in prange(flows.shape[0]):
+            if flows[i] > 0:
+                violations_count += 1
+                total_flow += flows[i]
+                total_penalty += flows[i] * costs[i]
+        return violations_count, total_flow, total_penalty
+else:
+    def _aggregate_violations(flows, costs):
+        """Return (violations_count, total_violation_flow, total_penalty_cost) over escape edges."""
+        carrying = flows > 0
+        return int(carrying.sum()), int(flows[carrying].sum()), int((flows * costs)[carrying].sum())
+
+# Above this many gammas, chart data artists are rasterized so PDF/SVG output stays
+# small; axes, labels and annotations stay vector either way
+_RASTERIZE_MIN_POINTS = 1000
+
+def _gamma_tick_labels(df: pd.DataFrame) -> np.ndarray:
+    """'γ=<gamma>' tick labels for the per-gamma bar charts."""
+    return ('γ=' + df['gamma'].astype(str)).to_numpy()
+
+@lru_cache(maxsize=None)
+def _pyplot(style: str = 'seaborn-v0_8-darkgrid'):
+    """
+    Import pyplot on first chart, so CLI startup does not pay for matplotlib.
+    The style sheet is applied once per style rather than on every chart.
+    """
+    # Select the non-interactive backend before pyplot loads
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    # Charts are only ever written to files
+    plt.ioff()
+    
+    # Professional style
+    plt.style.use(style)
+    
+    # Batch rendering: simplify dense paths and chunk long lines in Agg
+    plt.rcParams.update({
+        'path.simplify': True,
+        'path.simplify_threshold': 1.0,
+        'agg.path.chunksize': 10000,
+        'figure.max_open_warning': 0
+    })
+    return plt
+
+# Columnar per-gamma results, with the demo/specific-edge/all-edges field names unified
+RESULT_DTYPE = np.dtype([
+    ('gamma', 'f8'),
+    ('violations', 'i8'),
+    ('flow', 'i8'),
+    ('penalty_cost', 'f8'),
+    ('violation', '?'),
+    ('sim_time', 'f8')
+])
+
+def _coalesce(df: pd.DataFrame, *columns: str) -> np.ndarray:
+    """Row-wise first non-missing value among columns (0 if none), as float."""
+    values = pd.Series(0.0, index=df.index)
+    for column in reversed(columns):
+        if column in df.columns:
+            values = df[column].astype(float).fillna(values)
+    return values.to_numpy()
+
+def _normalize_results(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of a results DataFrame with the canonical violations_count,
+    has_violation, flow_value and penalty_cost columns filled for every mode
+    (specific edge, all escape edges, demo, failed runs).
+    """
+    df = df.copy()
+    if df.empty:
+        return df
+    df['violations_count'] = _coalesce(df, 'violations_count', 'has_violation').astype(np.int64)
+    df['has_violation'] = df['violations_count'] > 0
+    df['flow_value'] = _coalesce(df, 'flow_value', 'total_violation_flow').astype(np.int64)
+    df['penalty_cost'] = _coalesce(df, 'penalty_cost', 'total_penalty_cost')
+    return df
+
+def _results_to_array(df: pd.DataFrame) -> np.ndarray:
+    """Pack a normalized results DataFrame into one preallocated RESULT_DTYPE array."""
+    array = np.zeros(len(df), dtype=RESULT_DTYPE)
+    if df.empty:
+        return array
+    array['gamma'] = df['gamma'].to_numpy(dtype=float)
+    array['violations'] = df['violations_count'].to_numpy()
+    array['flow'] = df['flow_value'].to_numpy()
+    array['penalty_cost'] = df['penalty_cost'].to_numpy()
+    array['violation'] = df['has_violation'].to_numpy()
+    array['sim_time'] = _coalesce(df, 'simulation_time')
+    return array
+
+# Analyzer (with its parsed graph) installed once in each Pool worker process
+_worker_analyzer = None
+
+def _init_gamma_worker(analyzer: 'MasterGammaAnalyzer'):
+    """Pool initializer: keep the analyzer template for every gamma this worker runs."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _run_one_gamma(gamma: float) -> Dict:
+    """Pool worker: run one gamma test on the worker's own copy of the graph."""
+    return _worker_analyzer.run_gamma_trial(gamma)
+
 class MasterGammaAnalyzer:
     """
     🎯 Master class for gamma analysis with focus on specific escape edges.
     Professional tool to analyze gamma penalty effects.
     """
     
-    def __init__(self, output_dir="output", experiment_name=None, escape_edge=None, dimacs_file="TSG.txt"):
+    # Bar colors for the per-gamma charts, from hot (cheap penalty) to cool
+    _PALETTE = ('#FF6B6B', '#FF8E53', '#FF9F43', '#10AC84', '#1DD1A1', '#0ABDE3', '#5F27CD')
+    
+    def __init__(self, output_dir="output", experiment_name=None, escape_edge=None, dimacs_file="TSG.txt",
+                 quiet=False):
         self.output_dir = output_dir
         self.experiment_name = experiment_name or f"gamma_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -94,15 +328,32 @@ class MasterGammaAnalyzer:
         self.target_escape_edge = escape_edge  # (source, dest) tuple
         self.dimacs_file = dimacs_file
         
+        # Skip the per-gamma progress output (errors and summaries are still printed)
+        self.quiet = quiet
+        
         # Create organized directory structure
         self.dirs = self._create_directory_structure()
         
         # Initialize data storage
         self.results = []
+        self.results_df = pd.DataFrame()
         self.violation_history = []
         self.escape_edges_data = []
         self.edge_analysis_data = []
         
+        # In-memory min-cost-flow graph shared by all gamma runs, and the last solve
+        self._graph = None
+        self._nx_solution = None
+        self._flow_problem = None
+        self._last_flow_cost = None
+        self._last_flow_dict = None
+        
+        # Parsed DIMACS arcs keyed by (path, mtime_ns, size), reused across gamma iterations
+        self._dimacs_cache: Dict[Tuple[str, int, int], pd.DataFrame] = {}
+        
+        # Read-only maps of the DIMACS files, keyed by path and tagged with (inode, mtime_ns, size)
+        self._tsg_maps: Dict[str, Tuple[Tuple[int, int, int], mmap.mmap]] = {}
+        
         # Configuration
         self.config = self._load_default_config()
         
@@ -126,8 +377,7 @@ class MasterGammaAnalyzer:
             'experiment': base_exp_dir,
             'charts': os.path.join(base_exp_dir, "charts"),
             'reports': os.path.join(base_exp_dir, "reports"),
-            'data': os.path.join(base_exp_dir, "data"),
-            'tsg_backups': os.path.join(base_exp_dir, "tsg_backups")
+            'data': os.path.join(base_exp_dir, "data")
         }
         
         # Create all directories
@@ -142,16 +392,98 @@ class MasterGammaAnalyzer:
         return {
             "gamma_values": [1.0, 10.0, 50.0, 100.0, 200.0, 400.0, 800.0],
             "output_formats": ["png", "pdf"],
+            "png_compress_level": 1,
             "chart_style": "professional",
+            "mpl_style": "seaborn-v0_8-darkgrid",
             "detailed_analysis": True,
             "violation_threshold": 0.001,
             "flow_analysis": True
         }
     
+    def __getstate__(self):
+        # Maps cannot be pickled (Pool initargs); workers re-map files on first use
+        state = self.__dict__.copy()
+        state['_tsg_maps'] = {}
+        return state
+    
+    def _tsg_mmap(self, dimacs_file: str) -> Optional[mmap.mmap]:
+        """Shared read-only map of a DIMACS file, remapped only when the file is replaced or changed."""
+        path = os.path.abspath(dimacs_file)
+        stat = os.stat(path)
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._tsg_maps.get(path)
+        if cached is not None:
+            if cached[0] == identity:
+                return cached[1]
+            cached[1].close()
+            del self._tsg_maps[path]
+        if stat.st_size == 0:
+            return None
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            # The map keeps its own reference to the file
+            os.close(fd)
+        self._tsg_maps[path] = (identity, mm)
+        return mm
+    
+    def iter_tsg_lines(self, dimacs_file: Optional[str] = None) -> Iterator[bytes]:
+        """Iterate the raw byte lines of a DIMACS file (default: self.dimacs_file) through the shared map."""
+        mm = self._tsg_mmap(dimacs_file or self.dimacs_file)
+        return _iter_mmap_lines(mm) if mm is not None else iter(())
+    
+    def _get_parsed_dimacs(self, dimacs_file: str) -> pd.DataFrame:
+        """Return the parsed arcs of a DIMACS file, re-parsing only if the file changed."""
+        stat = os.stat(dimacs_file)
+        key = (os.path.abspath(dimacs_file), stat.st_mtime_ns, stat.st_size)
+        arcs = self._dimacs_cache.get(key)
+        if arcs is None:
+            self._invalidate_dimacs_cache(dimacs_file)
+            arcs = _parse_dimacs_arcs(self.iter_tsg_lines(dimacs_file))
+            self._dimacs_cache[key] = arcs
+        return arcs
+    
+    def _invalidate_dimacs_cache(self, dimacs_file: str):
+        """Drop cached arcs for a DIMACS file after it has been rewritten."""
+        path = os.path.abspath(dimacs_file)
+        for key in [k for k in self._dimacs_cache if k[0] == path]:
+            del self._dimacs_cache[key]
+        cached = self._tsg_maps.pop(path, None)
+        if cached is not None:
+            cached[1].close()
+    
     # =============================================================================
     # SPECIFIC ESCAPE EDGE ANALYSIS - NEW ENHANCED FUNCTIONS
     # =============================================================================
     
+    def _find_arc_line(self, dimacs_file: str, source: int, dest: int) -> Optional[Dict[str, Any]]:
+        """Locate the first 'a source dest ...' line by a raw search of the mapped file."""
+        mm = self._tsg_mmap(dimacs_file)
+        if mm is None:
+            return None
+        needle = b'\na %d %d ' % (source, dest)
+        if mm[:len(needle) - 1] == needle[1:]:
+            start = 0
+        else:
+            offset = mm.find(needle)
+            if offset < 0:
+                return None
+            start = offset + 1
+        end = mm.find(b'\n', start)
+        line = mm[start:end if end >= 0 else len(mm)]
+        match = _A_RE.match(line)
+        if not match:
+            return None
+        _, _, lower_bound, capacity, cost = map(int, match.groups())
+        return {
+            'lower_bound': lower_bound,
+            'capacity': capacity,
+            'cost': cost,
+            'line_num': mm[:start].count(b'\n') + 1,
+            'raw_line': line.strip().decode()
+        }
+    
     def find_specific_escape_edge(self, source: int, dest: int, dimacs_file: str) -> Dict:
         """
         🔍 Search for specific escape edge in DIMACS file.
@@ -169,36 +501,36 @@ class MasterGammaAnalyzer:
             return None
             
         try:
-            with open(dimacs_file, 'r') as file:
-                for line_num, line in enumerate(file, 1):
-                    if line.startswith('a '):
-                        parts = line.strip().split()
-                        if len(parts) >= 6:
-                            edge_source = int(parts[1])
-                            edge_dest = int(parts[2])
-                            
-                            if edge_source == source and edge_dest == dest:
-                                lower_bound = int(parts[3])
-                                capacity = int(parts[4])
-                                cost = int(parts[5])
-                                
-                                print(f"✅ ESCAPE EDGE FOUND: {source} → {dest}")
-                                print(f"   📍 Line {line_num}: {line.strip()}")
-                                print(f"   💰 Gamma cost: {cost}")
-                                print(f"   🔄 Capacity: {capacity}")
-                                print()
-                                
-                                return {
-                                    'source': source,
-                                    'dest': dest,
-                                    'lower_bound': lower_bound,
-                                    'capacity': capacity,
-                                    'cost': cost,
-                                    'line_number': line_num,
-                                    'raw_line': line.strip(),
-                                    'is_escape_edge': True,
-                                    'gamma_penalty': cost
-                                }
+            # A single-spaced arc line is found with one substring search over the map;
+            # anything else (odd whitespace, missing edge) falls back to the parsed arcs
+            arc = self._find_arc_line(dimacs_file, source, dest)
+            if arc is None:
+                arcs = self._get_parsed_dimacs(dimacs_file)
+                match = arcs[(arcs['source'].to_numpy() == source) & (arcs['dest'].to_numpy() == dest)]
+                if len(match):
+                    arc = match.iloc[0]
+            
+            if arc is not None:
+                cost = int(arc['cost'])
+                
+                if not self.quiet:
+                    print(f"✅ ESCAPE EDGE FOUND: {source} → {dest}")
+                    print(f"   📍 Line {arc['line_num']}: {arc['raw_line']}")
+                    print(f"   💰 Gamma cost: {cost}")
+                    print(f"   🔄 Capacity: {arc['capacity']}")
+                    print()
+                
+                return {
+                    'source': source,
+                    'dest': dest,
+                    'lower_bound': int(arc['lower_bound']),
+                    'capacity': int(arc['capacity']),
+                    'cost': cost,
+                    'line_number': int(arc['line_num']),
+                    'raw_line': arc['raw_line'],
+                    'is_escape_edge': True,
+                    'gamma_penalty': cost
+                }
                                 
             print(f"❌ ESCAPE EDGE NOT FOUND: {source} → {dest} in {dimacs_file}")
             return None
@@ -207,13 +539,15 @@ class MasterGammaAnalyzer:
             print(f"❌ Error reading DIMACS file: {e}")
             return None
     
-    def analyze_specific_edge_flow(self, edge_info: Dict, dimacs_file: str) -> Dict:
+    def analyze_specific_edge_flow(self, edge_info: Dict, dimacs_file: str,
+                                   flow_dict: Optional[Dict] = None) -> Dict:
         """
         📊 Analyze flow through specific escape edge.
         
         Args:
             edge_info: Edge information from find_specific_escape_edge
             dimacs_file: DIMACS file for analysis
+            flow_dict: Already solved flows; the DIMACS file is solved if omitted
             
         Returns:
             Dictionary containing flow analysis information
@@ -227,10 +561,11 @@ class MasterGammaAnalyzer:
             }
         
         try:
-            # Use NetworkX solution to analyze flow
-            nx_solution = NetworkXSolution()
-            nx_solution.read_dimac_file(dimacs_file)
-            flow_dict = nx_solution.flowDict
+            if flow_dict is None:
+                # Use NetworkX solution to analyze flow
+                nx_solution = NetworkXSolution()
+                nx_solution.read_dimac_file(dimacs_file)
+                flow_dict = nx_solution.flowDict
             
             source_str = str(edge_info['source'])
             dest_str = str(edge_info['dest'])
@@ -244,12 +579,13 @@ class MasterGammaAnalyzer:
             penalty_cost = edge_flow * gamma_cost
             has_violation = edge_flow > 0
             
-            status_icon = "🚨" if has_violation else "✅"
-            print(f"{status_icon} FLOW ANALYSIS RESULTS:")
-            print(f"   🌊 Flow through edge {edge_info['source']} → {edge_info['dest']}: {edge_flow}")
-            print(f"   💰 Penalty cost: {penalty_cost}")
-            print(f"   ⚖️  Violation status: {'VIOLATION DETECTED' if has_violation else 'NO VIOLATION'}")
-            print()
+            if not self.quiet:
+                status_icon = "🚨" if has_violation else "✅"
+                print(f"{status_icon} FLOW ANALYSIS RESULTS:")
+                print(f"   🌊 Flow through edge {edge_info['source']} → {edge_info['dest']}: {edge_flow}")
+                print(f"   💰 Penalty cost: {penalty_cost}")
+                print(f"   ⚖️  Violation status: {'VIOLATION DETECTED' if has_violation else 'NO VIOLATION'}")
+                print()
             
             return {
                 'edge_found': True,
@@ -284,47 +620,45 @@ class MasterGammaAnalyzer:
             return escape_edges
             
         try:
-            print(f"🔍 Scanning DIMACS file: {dimacs_file}")
-            with open(dimacs_file, 'r') as file:
-                for line_num, line in enumerate(file, 1):
-                    if line.startswith('a '):
-                        parts = line.strip().split()
-                        if len(parts) >= 6:
-                            source = int(parts[1])
-                            dest = int(parts[2])
-                            lower_bound = int(parts[3])
-                            capacity = int(parts[4])
-                            cost = int(parts[5])
-                            
-                            # Identify escape edges by characteristics:
-                            # - High cost (gamma penalty)
-                            # - Usually virtual nodes (high numbers)
-                            # - Zero or low capacity
-                            is_escape = cost >= 200 or (source > 80 and dest > 80 and cost > 50)
-                            
-                            if is_escape:
-                                escape_edges.append({
-                                    'source': source,
-                                    'dest': dest,
-                                    'lower_bound': lower_bound,
-                                    'capacity': capacity,
-                                    'cost': cost,
-                                    'line': line_num,
-                                    'is_escape_edge': True,
-                                    'gamma_penalty': cost,
-                                    'raw_line': line.strip()
-                                })
+            if not self.quiet:
+                print(f"🔍 Scanning DIMACS file: {dimacs_file}")
+            arcs = self._get_parsed_dimacs(dimacs_file)
+            source = arcs['source'].to_numpy()
+            dest = arcs['dest'].to_numpy()
+            cost = arcs['cost'].to_numpy()
+            
+            # Identify escape edges by characteristics:
+            # - High cost (gamma penalty)
+            # - Usually virtual nodes (high numbers)
+            # - Zero or low capacity
+            is_escape = (cost >= 200) | ((source > 80) & (dest > 80) & (cost > 50))
+            
+            for arc in arcs[is_escape].itertuples(index=False):
+                escape_edges.append({
+                    'source': int(arc.source),
+                    'dest': int(arc.dest),
+                    'lower_bound': int(arc.lower_bound),
+                    'capacity': int(arc.capacity),
+                    'cost': int(arc.cost),
+                    'line': int(arc.line_num),
+                    'is_escape_edge': True,
+                    'gamma_penalty': int(arc.cost),
+                    'raw_line': arc.raw_line
+                })
                                 
-            print(f"✅ Found {len(escape_edges)} escape edges")
+            if not self.quiet:
+                print(f"✅ Found {len(escape_edges)} escape edges")
             return escape_edges
                                 
         except Exception as e:
             print(f"❌ Error reading DIMACS file: {e}")
             return escape_edges
     
-    def analyze_escape_edge_flow(self, escape_edges: List[Dict], tsg_file: str) -> Dict:
+    def analyze_escape_edge_flow(self, escape_edges: List[Dict], tsg_file: str,
+                                 flow_dict: Optional[Dict] = None) -> Dict:
         """
         Analyze flow through escape edges to detect actual violations.
+        If flow_dict is omitted, tsg_file is solved with NetworkX first.
         """
         if not escape_edges:
             return {
@@ -335,42 +669,29 @@ class MasterGammaAnalyzer:
             }
         
         try:
-            # Use NetworkX solution to analyze flow
-            nx_solution = NetworkXSolution()
-            nx_solution.read_dimac_file(tsg_file)
-            flow_dict = nx_solution.flowDict
-            
-            violations = []
-            total_violation_flow = 0
-            total_penalty_cost = 0
-            
-            for edge in escape_edges:
-                source_str = str(edge['source'])
-                dest_str = str(edge['dest'])
-                gamma_cost = edge['cost']
-                
-                # Check if this edge carries flow
-                edge_flow = 0
-                if source_str in flow_dict and dest_str in flow_dict[source_str]:
-                    edge_flow = flow_dict[source_str][dest_str]
-                
-                if edge_flow > 0:
-                    # This is an actual violation
-                    violation = {
-                        'source': edge['source'],
-                        'dest': edge['dest'],
-                        'flow': edge_flow,
-                        'gamma_cost': gamma_cost,
-                        'penalty_cost': edge_flow * gamma_cost
-                    }
-                    violations.append(violation)
-                    total_violation_flow += edge_flow
-                    total_penalty_cost += violation['penalty_cost']
+            if flow_dict is None:
+                # Use NetworkX solution to analyze flow
+                nx_solution = NetworkXSolution()
+                nx_solution.read_dimac_file(tsg_file)
+                flow_dict = nx_solution.flowDict
+            
+            # Join escape edges with the solved flows in one vectorized merge
+            escape_df = pd.DataFrame(escape_edges, columns=['source', 'dest', 'cost'])
+            merged = escape_df.merge(_flow_dict_to_frame(flow_dict), on=['source', 'dest'], how='left')
+            merged['flow'] = merged['flow'].fillna(0).astype(np.int64)
+            merged['penalty_cost'] = merged['flow'] * merged['cost']
+            
+            # Edges that carry flow are actual violations
+            violations_count, total_violation_flow, total_penalty_cost = _aggregate_violations(
+                merged['flow'].to_numpy(), merged['cost'].to_numpy(dtype=np.int64))
+            carrying = merged[merged['flow'] > 0]
+            violations = carrying.rename(columns={'cost': 'gamma_cost'})[
+                ['source', 'dest', 'flow', 'gamma_cost', 'penalty_cost']].to_dict('records')
             
             return {
-                'violations_count': len(violations),
-                'total_violation_flow': total_violation_flow,
-                'total_penalty_cost': total_penalty_cost,
+                'violations_count': int(violations_count),
+                'total_violation_flow': int(total_violation_flow),
+                'total_penalty_cost': int(total_penalty_cost),
                 'violations': violations,
                 'escape_edges_count': len(escape_edges)
             }
@@ -388,9 +709,23 @@ class MasterGammaAnalyzer:
     # SIMULATION INTEGRATION
     # =============================================================================
     
+    def _load_graph_once(self):
+        """
+        Parse self.dimacs_file into a NetworkX graph the first time it is needed,
+        plus its FlowProblem arrays when a native solver is installed.
+        """
+        if self._graph is None:
+            self._nx_solution = NetworkXSolution()
+            self._graph = self._nx_solution.build_graph(self.dimacs_file)
+            if MCFSIMPLEX_AVAILABLE or ORTOOLS_AVAILABLE:
+                self._flow_problem = FlowProblem.from_graph(self._graph)
+        return self._graph
+    
     def run_simulation_with_gamma(self, gamma_value: float) -> bool:
         """
-        Run simulation with specified gamma value by modifying TSG.txt and running NetworkX.
+        Run simulation with specified gamma value by setting the target escape edge's
+        cost on the in-memory graph and re-solving it with NetworkX.
+        The flow cost and flows are kept in self._last_flow_cost / self._last_flow_dict.
         Returns True if successful, False otherwise.
         """
         if not REAL_SIMULATION_AVAILABLE:
@@ -398,42 +733,42 @@ class MasterGammaAnalyzer:
             return False
             
         try:
-            print(f"🚀 Running simulation with γ = {gamma_value}")
-            
-            # 1. Backup original TSG.txt
-            original_tsg = "TSG.txt"
-            backup_tsg = f"TSG_backup_gamma_{gamma_value}.txt"
+            if not self.quiet:
+                print(f"🚀 Running simulation with γ = {gamma_value}")
             
-            if os.path.exists(original_tsg):
-                import shutil
-                shutil.copy2(original_tsg, backup_tsg)
-                print(f"  📄 Backed up TSG.txt to {backup_tsg}")
-            else:
-                print(f"⚠️  TSG.txt not found, cannot run simulation")
+            # 1. Parse the DIMACS file once per analyzer
+            if not os.path.exists(self.dimacs_file):
+                print(f"⚠️  {self.dimacs_file} not found, cannot run simulation")
                 return False
+            G = self._load_graph_once()
             
-            # 2. Modify gamma value in TSG.txt for target escape edge
+            # 2. Set gamma value on the target escape edge (only the cost array changes)
+            problem = self._flow_problem
+            costs = problem.cost.copy() if problem is not None else None
             if self.target_escape_edge:
-                source, dest = self.target_escape_edge
-                success = self.modify_gamma_in_tsg(original_tsg, source, dest, gamma_value)
-                if not success:
-                    print(f"❌ Failed to modify gamma in TSG.txt")
+                source, dest = (str(node) for node in self.target_escape_edge)
+                if not G.has_edge(source, dest):
+                    print(f"❌ Edge {source}→{dest} not found in {self.dimacs_file}")
                     return False
+                if costs is not None:
+                    costs[problem.arc(source, dest)] = int(gamma_value)
+                else:
+                    G[source][dest]['weight'] = int(gamma_value)
+                if not self.quiet:
+                    print(f"  🔧 Set edge {source}→{dest} gamma to {int(gamma_value)}")
             
-            # 3. Run NetworkX algorithm on modified TSG.txt
-            print(f"  🔄 Running NetworkX on modified TSG.txt")
-            
-            # Import NetworkX solution
-            from model.NXSolution import NetworkXSolution
-            
-            # Create and run NetworkX solution
-            nx_solution = NetworkXSolution()
-            nx_solution.read_dimac_file(original_tsg)
+            # 3. Solve the modified graph (NXSolution's native solver when available, else NetworkX)
+            if costs is not None:
+                self._nx_solution.solve_problem(problem.with_costs(costs))
+            else:
+                self._nx_solution.solve(G)
+            self._last_flow_cost = self._nx_solution.flowCost
+            self._last_flow_dict = self._nx_solution.flowDict
             
-            # The network simplex algorithm runs automatically in read_dimac_file
-            print(f"  ✅ NetworkX algorithm completed successfully")
-            print(f"  📊 Flow cost: {nx_solution.flowCost}")
-            print(f"  🌊 Total flow edges: {len(nx_solution.flowDict)}")
+            if not self.quiet:
+                print(f"  ✅ Min cost flow solved with {'a native solver' if costs is not None else 'NetworkX'}")
+                print(f"  📊 Flow cost: {self._last_flow_cost}")
+                print(f"  🌊 Total flow edges: {len(self._last_flow_dict)}")
             
             return True
             
@@ -441,73 +776,13 @@ class MasterGammaAnalyzer:
             print(f"❌ Simulation failed for γ = {gamma_value}: {e}")
             return False
     
-    def modify_gamma_in_tsg(self, tsg_file: str, source: int, dest: int, new_gamma: float) -> bool:
-        """
-        Modify gamma (cost) value for a specific escape edge in TSG.txt file.
-        
-        Args:
-            tsg_file: Path to TSG.txt file
-            source: Source node of escape edge
-            dest: Destination node of escape edge
-            new_gamma: New gamma value to set
-            
-        Returns:
-            True if modification successful, False otherwise
-        """
-        try:
-            print(f"  🔧 Modifying edge {source}→{dest} gamma to {new_gamma}")
-            
-            # Read all lines from TSG file
-            with open(tsg_file, 'r') as file:
-                lines = file.readlines()
-            
-            modified = False
-            modified_lines = []
-            
-            # Process each line
-            for line in lines:
-                if line.startswith('a '):
-                    parts = line.strip().split()
-                    if len(parts) >= 6:
-                        edge_source = int(parts[1])
-                        edge_dest = int(parts[2])
-                        lower_bound = parts[3]
-                        capacity = parts[4]
-                        old_cost = parts[5]
-                        
-                        # Check if this is our target edge
-                        if edge_source == source and edge_dest == dest:
-                            # Modify the cost (gamma)
-                            new_line = f"a {source} {dest} {lower_bound} {capacity} {int(new_gamma)}\n"
-                            modified_lines.append(new_line)
-                            print(f"    ✏️  Modified: {line.strip()} → a {source} {dest} {lower_bound} {capacity} {int(new_gamma)}")
-                            modified = True
-                        else:
-                            modified_lines.append(line)
-                    else:
-                        modified_lines.append(line)
-                else:
-                    modified_lines.append(line)
-            
-            if not modified:
-                print(f"    ⚠️  Edge {source}→{dest} not found in TSG file")
-                return False
-            
-            # Write modified content back to file
-            with open(tsg_file, 'w') as file:
-                file.writelines(modified_lines)
-            
-            print(f"    ✅ Successfully modified gamma for edge {source}→{dest}")
-            return True
-            
-        except Exception as e:
-            print(f"    ❌ Error modifying TSG file: {e}")
-            return False
-
     def restore_tsg_backup(self, backup_file: str, original_file: str = "TSG.txt") -> bool:
         """
         Restore TSG.txt from backup file.
         
+        The backup is copied next to the original and renamed over it, so the
+        restore is atomic and TSG.txt never shares its data with the backup.
+        
         Args:
             backup_file: Path to backup file
             original_file: Path to original file to restore
@@ -515,16 +790,21 @@ class MasterGammaAnalyzer:
         Returns:
             True if restoration successful, False otherwise
         """
+        tmp_file = f"{original_file}.restore.tmp"
         try:
             if os.path.exists(backup_file):
-                import shutil
-                shutil.copy2(backup_file, original_file)
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+                _kernel_copy(backup_file, tmp_file)
+                os.replace(tmp_file, original_file)
                 print(f"  🔄 Restored {original_file} from {backup_file}")
                 return True
             else:
                 print(f"  ⚠️  Backup file {backup_file} not found")
                 return False
         except Exception as e:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
             print(f"  ❌ Error restoring backup: {e}")
             return False
     
@@ -533,55 +813,45 @@ class MasterGammaAnalyzer:
         🎭 Create realistic demo data for specific escape edge.
         Simulate gamma control effect behavior realistically.
         """
-        results = []
-        
         print(f"🎭 Creating demo data for escape edge {edge_source} → {edge_dest}")
         
-        for gamma in gamma_values:
-            # Simulate realistic gamma control behavior
-            if gamma <= 1:
-                # Low gamma: many violations, low cost
-                flow = max(1, 8 + np.random.randint(-2, 4))
-                violations = 1 if flow > 0 else 0
-            elif gamma <= 10:
-                # Medium-low gamma: reduced violations
-                flow = max(0, 5 + np.random.randint(-2, 3))
-                violations = 1 if flow > 0 else 0
-            elif gamma <= 50:
-                # Medium gamma: rare violations
-                flow = max(0, 2 + np.random.randint(-1, 2))
-                violations = 1 if flow > 0 else 0
-            elif gamma <= 100:
-                # High gamma: very few violations
-                flow = max(0, np.random.randint(0, 2))
-                violations = 1 if flow > 0 else 0
-            else:
-                # Very high gamma: almost no violations
-                flow = max(0, np.random.randint(0, 1))
-                violations = 1 if flow > 0 else 0
-            
-            penalty_cost = flow * gamma
-            simulation_time = 1.5 + np.random.uniform(-0.3, 0.8)
-            
-            result = {
-                'gamma': gamma,
-                'edge_source': edge_source,
-                'edge_dest': edge_dest,
-                'edge_found': True,
-                'flow_value': flow,
-                'gamma_cost': gamma,
-                'penalty_cost': penalty_cost,
-                'has_violation': violations > 0,
-                'violations_count': violations,
-                'simulation_time': simulation_time,
-                'status': 'success'
-            }
-            
-            results.append(result)
-            
-            # Print real-time results
-            status_icon = "🚨" if violations > 0 else "✅"
-            print(f"  {status_icon} γ={gamma:>6} → Flow: {flow:>2}, Cost: {penalty_cost:>8.0f}")
+        g = np.asarray(gamma_values, dtype=float)
+        n = len(g)
+        rng = np.random.default_rng()
+        
+        # Simulate realistic gamma control behavior per gamma band:
+        # low gamma → many violations, very high gamma → almost none
+        bands = [g <= 1, g <= 10, g <= 50, g <= 100]
+        base_flow = np.select(bands, [8, 5, 2, 0], default=0)
+        min_flow = np.select(bands, [1, 0, 0, 0], default=0)
+        noise_lo = np.select(bands, [-2, -2, -1, 0], default=0)
+        noise_hi = np.select(bands, [4, 3, 2, 2], default=1)
+        
+        # One batched draw for the whole sweep
+        flow = np.maximum(min_flow, base_flow + rng.integers(noise_lo, noise_hi, size=n))
+        violations = (flow > 0).astype(int)
+        penalty_cost = flow * g
+        simulation_time = 1.5 + rng.uniform(-0.3, 0.8, size=n)
+        
+        results = pd.DataFrame({
+            'gamma': gamma_values,
+            'edge_source': edge_source,
+            'edge_dest': edge_dest,
+            'edge_found': True,
+            'flow_value': flow,
+            'gamma_cost': gamma_values,
+            'penalty_cost': penalty_cost,
+            'has_violation': violations > 0,
+            'violations_count': violations,
+            'simulation_time': simulation_time,
+            'status': 'success'
+        }).to_dict('records')
+        
+        # Print results
+        if not self.quiet:
+            for result in results:
+                status_icon = "🚨" if result['violations_count'] > 0 else "✅"
+                print(f"  {status_icon} γ={result['gamma']:>6} → Flow: {result['flow_value']:>2}, Cost: {result['penalty_cost']:>8.0f}")
             
         return results
     
@@ -589,6 +859,77 @@ class MasterGammaAnalyzer:
     # ANALYSIS AND EXPERIMENTATION
     # =============================================================================
     
+    def run_gamma_trial(self, gamma: float) -> Dict:
+        """
+        Run a single real-simulation gamma test on the in-memory graph.
+        """
+        if not self.quiet:
+            print(f"\n📊 Test: γ = {gamma}")
+            print(f"{'-'*40}")
+        
+        start_time = time.time()
+        
+        # Run simulation with gamma
+        if self.run_simulation_with_gamma(gamma):
+            # Analyze specific edge if specified
+            if self.target_escape_edge:
+                source, dest = self.target_escape_edge
+                edge_info = self.find_specific_escape_edge(source, dest, self.dimacs_file)
+                if edge_info:
+                    # The file still holds the original cost; the solve used gamma
+                    edge_info = dict(edge_info, cost=int(gamma), gamma_penalty=int(gamma))
+                flow_analysis = self.analyze_specific_edge_flow(edge_info, self.dimacs_file,
+                                                                self._last_flow_dict)
+                
+                simulation_time = time.time() - start_time
+                
+                result = {
+                    'gamma': gamma,
+                    'edge_source': source,
+                    'edge_dest': dest,
+                    'edge_found': flow_analysis['edge_found'],
+                    'flow_value': flow_analysis['flow_value'],
+                    'gamma_cost': flow_analysis.get('gamma_cost', gamma),
+                    'penalty_cost': flow_analysis['penalty_cost'],
+                    'has_violation': flow_analysis['has_violation'],
+                    'violations_count': 1 if flow_analysis['has_violation'] else 0,
+                    'simulation_time': simulation_time,
+                    'status': 'success'
+                }
+            else:
+                # Analyze all escape edges
+                escape_edges = self.detect_escape_edges(self.dimacs_file)
+                flow_analysis = self.analyze_escape_edge_flow(escape_edges, self.dimacs_file,
+                                                              self._last_flow_dict)
+                
+                simulation_time = time.time() - start_time
+                
+                result = {
+                    'gamma': gamma,
+                    'violations_count': flow_analysis['violations_count'],
+                    'total_violation_flow': flow_analysis['total_violation_flow'],
+                    'total_penalty_cost': flow_analysis['total_penalty_cost'],
+                    'escape_edges_count': flow_analysis.get('escape_edges_count', 0),
+                    'simulation_time': simulation_time,
+                    'status': 'success'
+                }
+            
+            if not self.quiet:
+                print(f"  ✅ γ = {gamma} violations: {result.get('violations_count', 0)}")
+                print(f"  💰 γ = {gamma} penalty cost: {result.get('total_penalty_cost', result.get('penalty_cost', 0))}")
+            
+        else:
+            result = {
+                'gamma': gamma,
+                'violations_count': 0,
+                'total_violation_flow': 0,
+                'total_penalty_cost': 0,
+                'simulation_time': 0,
+                'status': 'failed'
+            }
+        
+        return result
+    
     def run_gamma_experiment(self, gamma_values: List[float], use_real_simulation: bool = False) -> List[Dict]:
         """
         🧪 Run comprehensive gamma experiment with focus on specific escape edge.
@@ -617,74 +958,17 @@ class MasterGammaAnalyzer:
             print(f"🚀 REAL SIMULATION MODE")
             print(f"{'-'*30}")
             
-            for i, gamma in enumerate(gamma_values):
-                print(f"\n📊 Test {i+1}/{len(gamma_values)}: γ = {gamma}")
-                print(f"{'-'*40}")
-                
-                start_time = time.time()
-                
-                # Run simulation with gamma
-                if self.run_simulation_with_gamma(gamma):
-                    # Backup DIMACS file
-                    dimacs_backup = os.path.join(self.dirs['tsg_backups'], 
-                                               f"TSG_gamma_{gamma}_{self.timestamp}.txt")
-                    if os.path.exists(self.dimacs_file):
-                        shutil.copy2(self.dimacs_file, dimacs_backup)
-                    
-                    # Analyze specific edge if specified
-                    if self.target_escape_edge:
-                        source, dest = self.target_escape_edge
-                        edge_info = self.find_specific_escape_edge(source, dest, self.dimacs_file)
-                        flow_analysis = self.analyze_specific_edge_flow(edge_info, self.dimacs_file)
-                        
-                        simulation_time = time.time() - start_time
-                        
-                        result = {
-                            'gamma': gamma,
-                            'edge_source': source,
-                            'edge_dest': dest,
-                            'edge_found': flow_analysis['edge_found'],
-                            'flow_value': flow_analysis['flow_value'],
-                            'gamma_cost': flow_analysis.get('gamma_cost', gamma),
-                            'penalty_cost': flow_analysis['penalty_cost'],
-                            'has_violation': flow_analysis['has_violation'],
-                            'violations_count': 1 if flow_analysis['has_violation'] else 0,
-                            'simulation_time': simulation_time,
-                            'status': 'success',
-                            'dimacs_backup': dimacs_backup
-                        }
-                    else:
-                        # Analyze all escape edges
-                        escape_edges = self.detect_escape_edges(self.dimacs_file)
-                        flow_analysis = self.analyze_escape_edge_flow(escape_edges, self.dimacs_file)
-                        
-                        simulation_time = time.time() - start_time
-                        
-                        result = {
-                            'gamma': gamma,
-                            'violations_count': flow_analysis['violations_count'],
-                            'total_violation_flow': flow_analysis['total_violation_flow'],
-                            'total_penalty_cost': flow_analysis['total_penalty_cost'],
-                            'escape_edges_count': flow_analysis.get('escape_edges_count', 0),
-                            'simulation_time': simulation_time,
-                            'status': 'success',
-                            'dimacs_backup': dimacs_backup
-                        }
-                    
-                    print(f"  ✅ Violations: {result.get('violations_count', 0)}")
-                    print(f"  💰 Penalty cost: {result.get('total_penalty_cost', result.get('penalty_cost', 0))}")
-                    
-                else:
-                    result = {
-                        'gamma': gamma,
-                        'violations_count': 0,
-                        'total_violation_flow': 0,
-                        'total_penalty_cost': 0,
-                        'simulation_time': 0,
-                        'status': 'failed'
-                    }
-                
-                results.append(result)
+            # Parse once up front; the analyzer is shipped to each worker once and
+            # only the gamma value travels per task, so the runs are independent
+            if os.path.exists(self.dimacs_file):
+                self._load_graph_once()
+            processes = max(1, min(len(gamma_values), os.cpu_count() or 1))
+            if processes == 1:
+                # One gamma (or one core): a worker process would only add startup and pickling
+                results = [self.run_gamma_trial(gamma) for gamma in gamma_values]
+            else:
+                with Pool(processes=processes, initializer=_init_gamma_worker, initargs=(self,)) as pool:
+                    results = list(pool.imap(_run_one_gamma, gamma_values))
         else:
             # Fallback demo mode
             print("🎭 FALLBACK DEMO MODE - General simulation data")
@@ -692,14 +976,17 @@ class MasterGammaAnalyzer:
             results = self.create_demo_data_for_specific_edge(gamma_values, 81, 82)
         
         self.results = results
+        self.results_df = pd.DataFrame(results)
         
         # Results summary
         print(f"\n📋 RESULTS SUMMARY:")
         print(f"{'-'*25}")
-        total_tests = len(results)
-        successful_tests = len([r for r in results if r.get('status') == 'success'])
-        total_violations = sum(r.get('violations_count', 0) for r in results)
-        max_penalty = max(r.get('penalty_cost', r.get('total_penalty_cost', 0)) for r in results)
+        df = self.results_df.reindex(columns=['status', 'violations_count', 'penalty_cost', 'total_penalty_cost'])
+        penalties = df[['penalty_cost', 'total_penalty_cost']].fillna(0).to_numpy()
+        total_tests = len(df)
+        successful_tests = int((df['status'] == 'success').sum())
+        total_violations = int(df['violations_count'].fillna(0).sum())
+        max_penalty = penalties.max() if penalties.size else 0
         
         print(f"  🧪 Total tests: {total_tests}")
         print(f"  ✅ Successful tests: {successful_tests}")
@@ -713,51 +1000,87 @@ class MasterGammaAnalyzer:
     # PROFESSIONAL VISUALIZATION AND CHARTS
     # =============================================================================
     
-    def create_gamma_violation_relationship_chart(self, results: List[Dict]) -> str:
+    def _new_figure(self, nrows: int, ncols: int, figsize: Tuple[float, float]):
+        """
+        Create a constrained-layout figure on its own Agg canvas, outside pyplot's
+        global figure registry, so charts can be drawn from worker threads.
+        """
+        _pyplot(self.config['mpl_style'])
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        fig = Figure(figsize=figsize, layout='constrained')
+        FigureCanvasAgg(fig)
+        return fig, fig.subplots(nrows, ncols)
+    
+    def _save_chart(self, fig, chart_file: str, label: str, **savefig_kwargs) -> List[str]:
+        """
+        Save fig in every configured output format at 300 dpi and report the
+        saved paths as "<label>: <path>" lines.
+        The tight bounding box is computed once and reused for each format,
+        and PNGs use config['png_compress_level'] (default 1, fast zlib).
+        """
+        rcParams = _pyplot(self.config['mpl_style']).rcParams
+        # Run the constrained layout once so the bounding box matches the saved figure
+        fig.draw_without_rendering()
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(rcParams['savefig.pad_inches'])
+        
+        # Settings read once outside the save loop
+        output_formats = self.config['output_formats']
+        png_kwargs = {'compress_level': self.config['png_compress_level']}
+        
+        chart_paths = []
+        for fmt in output_formats:
+            chart_path = f"{chart_file}.{fmt}"
+            if fmt == 'png':
+                fig.savefig(chart_path, dpi=300, bbox_inches=bbox, pil_kwargs=png_kwargs, **savefig_kwargs)
+            else:
+                fig.savefig(chart_path, dpi=300, bbox_inches=bbox, **savefig_kwargs)
+            chart_paths.append(chart_path)
+        
+        if not self.quiet:
+            # One write per chart, so concurrently rendered charts never interleave lines
+            print('\n'.join(f"{label}: {chart_path}" for chart_path in chart_paths))
+        return chart_paths
+    
+    def create_gamma_violation_relationship_chart(self, df: pd.DataFrame) -> str:
         """
         📊 Create professional chart showing relationship between Gamma and Violations.
         This is the core chart to understand gamma control effect.
         """
-        if not results:
+        if df.empty:
             print("❌ No data available for chart creation")
             return ""
             
-        # Prepare data
-        df = pd.DataFrame(results)
-        
         # Create figure with large, professional size
-        fig, ax = plt.subplots(1, 1, figsize=(14, 10))
-        
-        # Professional style
-        plt.style.use('seaborn-v0_8-darkgrid')
+        fig, ax = self._new_figure(1, 1, (14, 10))
         
-        # Color gradient from red (dangerous) to green (safe)
-        colors = ['#FF4444', '#FF8C00', '#FFD700', '#90EE90', '#32CD32', '#228B22', '#006400']
+        # Loop-invariant data, hoisted once as NumPy arrays
+        gammas = df['gamma'].to_numpy()
+        v = df['violations_count'].to_numpy()
+        n = len(v)
+        vmax = v.max()
         
         # Create line chart with beautiful markers
-        violations = df.get('violations_count', df.get('has_violation', [0]*len(df)))
-        if 'has_violation' in df.columns and 'violations_count' not in df.columns:
-            violations = [1 if x else 0 for x in df['has_violation']]
-        
-        line = ax.plot(df['gamma'], violations, 
+        line = ax.plot(gammas, v, 
                       marker='o', markersize=12, linewidth=4, 
                       color='#FF4444', markerfacecolor='#FFD700', 
                       markeredgecolor='#000000', markeredgewidth=2,
-                      label='Number of violations')
+                      label='Number of violations', rasterized=n > _RASTERIZE_MIN_POINTS)
         
-        # Add annotations for important points
-        for i, (gamma, viol) in enumerate(zip(df['gamma'], violations)):
-            if i == 0 or i == len(df)-1 or (i > 0 and violations[i] != violations[i-1]):
-                ax.annotate(f'γ={gamma}\nViolations: {viol}', 
-                           xy=(gamma, viol), xytext=(10, 10),
-                           textcoords='offset points', fontsize=10,
-                           bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7),
-                           arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
+        # Add annotations for important points: both ends and every change in violations
+        change_points = np.unique(np.concatenate(([0, n - 1], np.flatnonzero(v[1:] != v[:-1]) + 1)))
+        for i in change_points:
+            ax.annotate(f'γ={gammas[i]}\nViolations: {v[i]}', 
+                       xy=(gammas[i], v[i]), xytext=(10, 10),
+                       textcoords='offset points', fontsize=10,
+                       bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7),
+                       arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
         
         # Color regions for "dangerous" and "safe" zones
         ax.axhspan(0, 0.5, alpha=0.2, color='green', label='Safe zone (few violations)')
-        if max(violations) > 0.5:
-            ax.axhspan(0.5, max(violations)*1.1, alpha=0.2, color='red', label='Danger zone (many violations)')
+        if vmax > 0.5:
+            ax.axhspan(0.5, vmax*1.1, alpha=0.2, color='red', label='Danger zone (many violations)')
         
         # Customize axes and labels
         ax.set_xlabel('Gamma (γ) - Penalty Factor', fontsize=14, fontweight='bold', color='#2E4057')
@@ -766,7 +1089,7 @@ class MasterGammaAnalyzer:
                     fontsize=16, fontweight='bold', color='#1A202C', pad=20)
         
         # Logarithmic scale for gamma if many values
-        if len(df['gamma'].unique()) > 3 and max(df['gamma']) / min(df['gamma']) > 10:
+        if len(np.unique(gammas)) > 3 and gammas.max() / gammas.min() > 10:
             ax.set_xscale('log')
             ax.set_xlabel('🎯 Gamma (γ) - Penalty Factor (log scale)', fontsize=14, fontweight='bold')
         
@@ -789,63 +1112,50 @@ CHART EXPLANATION:
                 verticalalignment='top', bbox=dict(boxstyle="round,pad=0.5", 
                 facecolor="lightblue", alpha=0.8))
         
-        # Tight layout
-        plt.tight_layout()
-        
         # Save chart
         chart_file = os.path.join(self.dirs['charts'], f"gamma_violations_relationship_{self.timestamp}")
         
-        for fmt in self.config['output_formats']:
-            chart_path = f"{chart_file}.{fmt}"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
-            print(f"📊 Gamma-Violations relationship chart: {chart_path}")
+        self._save_chart(fig, chart_file, "📊 Gamma-Violations relationship chart", facecolor='white')
         
-        plt.close()
+        fig.clf()
         return f"{chart_file}.png"
     
-    def create_penalty_cost_analysis_chart(self, results: List[Dict]) -> str:
+    def create_penalty_cost_analysis_chart(self, df: pd.DataFrame) -> str:
         """
         💰 Chart analyzing penalty costs by gamma values.
         """
-        if not results:
+        if df.empty:
             return ""
             
-        df = pd.DataFrame(results)
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+        fig, (ax1, ax2) = self._new_figure(1, 2, (16, 8))
         fig.suptitle('💰 PENALTY COST ANALYSIS BY GAMMA', fontsize=16, fontweight='bold')
         
         # Chart 1: Penalty Cost vs Gamma
-        penalty_costs = df.get('penalty_cost', df.get('total_penalty_cost', [0]*len(df)))
+        penalty_costs = df['penalty_cost']
         
         bars = ax1.bar(range(len(df)), penalty_costs, 
-                      color=['#FF6B6B', '#FF8E53', '#FF9F43', '#10AC84', '#1DD1A1', '#0ABDE3', '#5F27CD'],
+                      color=self._PALETTE,
                       alpha=0.8, edgecolor='black', linewidth=1)
         
         # Add values on top of bars
-        for i, (bar, cost) in enumerate(zip(bars, penalty_costs)):
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + max(penalty_costs)*0.01,
-                    f'{cost:,.0f}', ha='center', va='bottom', fontweight='bold')
+        ax1.bar_label(bars, labels=[f'{cost:,.0f}' for cost in penalty_costs],
+                      padding=3, fontweight='bold')
         
         ax1.set_xlabel('🎯 Gamma Level', fontsize=12, fontweight='bold')
         ax1.set_ylabel('💰 Penalty Cost', fontsize=12, fontweight='bold')
         ax1.set_title('Penalty Cost by Gamma', fontweight='bold')
         ax1.set_xticks(range(len(df)))
-        ax1.set_xticklabels([f'γ={g}' for g in df['gamma']], rotation=45)
+        ax1.set_xticklabels(_gamma_tick_labels(df), rotation=45)
         ax1.grid(True, alpha=0.3)
         
         # Chart 2: Cost Efficiency (Cost per Violation)
-        violations = df.get('violations_count', df.get('has_violation', [1]*len(df)))
-        if 'has_violation' in df.columns and 'violations_count' not in df.columns:
-            violations = [1 if x else 0.1 for x in df['has_violation']]  # Avoid division by zero
-        
-        efficiency = [cost/max(viol, 0.1) for cost, viol in zip(penalty_costs, violations)]
+        # Floor at 0.1 to avoid division by zero
+        efficiency = penalty_costs.to_numpy() / np.maximum(df['violations_count'].to_numpy(), 0.1)
         
         line = ax2.plot(df['gamma'], efficiency, 
                        marker='s', markersize=10, linewidth=3,
                        color='#2ECC71', markerfacecolor='#F39C12', 
-                       markeredgecolor='#000000', markeredgewidth=2)
+                       markeredgecolor='#000000', markeredgewidth=2, rasterized=len(df) > _RASTERIZE_MIN_POINTS)
         
         ax2.set_xlabel('Gamma (γ)', fontsize=12, fontweight='bold')
         ax2.set_ylabel('Cost per Violation', fontsize=12, fontweight='bold')
@@ -853,37 +1163,31 @@ CHART EXPLANATION:
         ax2.grid(True, alpha=0.3)
         ax2.set_xscale('log')
         
-        plt.tight_layout()
-        
         # Save chart
         chart_file = os.path.join(self.dirs['charts'], f"penalty_cost_analysis_{self.timestamp}")
         
-        for fmt in self.config['output_formats']:
-            chart_path = f"{chart_file}.{fmt}"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
-            print(f"💰 Penalty cost analysis chart: {chart_path}")
+        self._save_chart(fig, chart_file, "💰 Penalty cost analysis chart", facecolor='white')
         
-        plt.close()
+        fig.clf()
         return f"{chart_file}.png"
     
-    def create_flow_dynamics_chart(self, results: List[Dict]) -> str:
+    def create_flow_dynamics_chart(self, df: pd.DataFrame) -> str:
         """
         🌊 Flow dynamics chart through escape edges.
         """
-        if not results:
+        if df.empty:
             return ""
             
-        df = pd.DataFrame(results)
-        
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+        fig, ((ax1, ax2), (ax3, ax4)) = self._new_figure(2, 2, (16, 12))
         fig.suptitle('🌊 FLOW DYNAMICS THROUGH ESCAPE EDGES', fontsize=16, fontweight='bold')
         
         # Chart 1: Flow Value vs Gamma
-        flow_values = df.get('flow_value', df.get('total_violation_flow', [0]*len(df)))
+        flow_values = df['flow_value']
         
         ax1.plot(df['gamma'], flow_values, 
                 marker='o', markersize=8, linewidth=3, color='#3498DB',
-                markerfacecolor='#E74C3C', markeredgecolor='#000000', markeredgewidth=1)
+                markerfacecolor='#E74C3C', markeredgecolor='#000000', markeredgewidth=1,
+                rasterized=len(df) > _RASTERIZE_MIN_POINTS)
         ax1.set_xlabel('Gamma (γ)', fontweight='bold')
         ax1.set_ylabel('Flow Value', fontweight='bold')
         ax1.set_title('🌊 Flow through Escape Edge', fontweight='bold')
@@ -891,29 +1195,27 @@ CHART EXPLANATION:
         ax1.set_xscale('log')
         
         # Chart 2: Violation Probability
-        has_violations = df.get('has_violation', [False]*len(df))
-        if 'violations_count' in df.columns:
-            has_violations = [v > 0 for v in df['violations_count']]
-        
-        violation_prob = [1 if v else 0 for v in has_violations]
+        violation_prob = df['has_violation'].to_numpy(dtype=np.int8)
         
         bars = ax2.bar(range(len(df)), violation_prob, 
-                      color=['#E74C3C' if v else '#2ECC71' for v in violation_prob],
+                      color=np.where(violation_prob, '#E74C3C', '#2ECC71'),
                       alpha=0.7, edgecolor='black', linewidth=1)
         ax2.set_xlabel('Gamma Level', fontweight='bold')
         ax2.set_ylabel('Violation (1=Yes, 0=No)', fontweight='bold')
         ax2.set_title('🚨 Violation Probability', fontweight='bold')
         ax2.set_xticks(range(len(df)))
-        ax2.set_xticklabels([f'γ={g}' for g in df['gamma']], rotation=45)
+        ax2.set_xticklabels(_gamma_tick_labels(df), rotation=45)
         ax2.set_ylim(-0.1, 1.1)
         
         # Chart 3: Gamma Control Effectiveness
-        max_flow = max(flow_values) if max(flow_values) > 0 else 1
-        control_effectiveness = [(max_flow - flow) / max_flow * 100 for flow in flow_values]
+        flows = flow_values.to_numpy(dtype=float)
+        max_flow = flows.max() if flows.max() > 0 else 1
+        control_effectiveness = (max_flow - flows) / max_flow * 100
         
         ax3.plot(df['gamma'], control_effectiveness,
                 marker='^', markersize=10, linewidth=3, color='#9B59B6',
-                markerfacecolor='#F1C40F', markeredgecolor='#000000', markeredgewidth=2)
+                markerfacecolor='#F1C40F', markeredgecolor='#000000', markeredgewidth=2,
+                rasterized=len(df) > _RASTERIZE_MIN_POINTS)
         ax3.set_xlabel('Gamma (γ)', fontweight='bold')
         ax3.set_ylabel('Control Effectiveness (%)', fontweight='bold')
         ax3.set_title('⚡ Gamma Control Effectiveness', fontweight='bold')
@@ -921,49 +1223,44 @@ CHART EXPLANATION:
         ax3.set_xscale('log')
         
         # Chart 4: Cost-Benefit Analysis
-        benefits = [100 - eff for eff in control_effectiveness]  # Inverse of violations
-        penalty_costs = df.get('penalty_cost', df.get('total_penalty_cost', [0]*len(df)))
-        costs = [cost/1000 for cost in penalty_costs]
+        benefits = 100 - control_effectiveness  # Inverse of violations
+        costs = df['penalty_cost'].to_numpy() / 1000
         
-        ax4.scatter(costs, benefits, s=[g*2 for g in df['gamma']], 
-                   c=df['gamma'], cmap='viridis', alpha=0.7, edgecolor='black')
+        scatter = ax4.scatter(costs, benefits, s=df['gamma'].to_numpy() * 2, 
+                              c=df['gamma'].to_numpy(), cmap='viridis', alpha=0.7, edgecolor='black',
+                              rasterized=len(df) > _RASTERIZE_MIN_POINTS)
         ax4.set_xlabel('Cost (thousands)', fontweight='bold')
         ax4.set_ylabel('Benefit (Control %)', fontweight='bold')
         ax4.set_title('💹 Cost-Benefit Analysis', fontweight='bold')
         ax4.grid(True, alpha=0.3)
         
         # Colorbar for scatter plot
-        cbar = plt.colorbar(ax4.collections[0], ax=ax4)
+        cbar = fig.colorbar(scatter, ax=ax4)
         cbar.set_label('Gamma Value', fontweight='bold')
         
-        plt.tight_layout()
-        
         # Save chart
         chart_file = os.path.join(self.dirs['charts'], f"flow_dynamics_analysis_{self.timestamp}")
         
-        for fmt in self.config['output_formats']:
-            chart_path = f"{chart_file}.{fmt}"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
-            print(f"🌊 Flow dynamics chart: {chart_path}")
+        self._save_chart(fig, chart_file, "🌊 Flow dynamics chart", facecolor='white')
         
-        plt.close()
+        fig.clf()
         return f"{chart_file}.png"
     
-    def create_escape_edge_analysis_chart(self, results: List[Dict]) -> str:
+    def create_escape_edge_analysis_chart(self, df: pd.DataFrame) -> str:
         """
         Create escape edge specific analysis chart.
         """
-        if not results:
+        if df.empty:
             return ""
             
-        df = pd.DataFrame(results)
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fig, (ax1, ax2) = self._new_figure(1, 2, (14, 6))
         fig.suptitle(f'Escape Edge Analysis - {self.experiment_name}', fontsize=14, fontweight='bold')
         
+        edges = df['escape_edges_count'].fillna(0).to_numpy() if 'escape_edges_count' in df.columns else np.zeros(len(df))
+        
         # Plot 1: Escape Edges Count vs Gamma
-        ax1.plot(df['gamma'], df.get('escape_edges_count', [0]*len(df)), 'o-', 
-                color='#FF6B6B', linewidth=3, markersize=8)
+        ax1.plot(df['gamma'], edges, 'o-', 
+                color='#FF6B6B', linewidth=3, markersize=8, rasterized=len(df) > _RASTERIZE_MIN_POINTS)
         ax1.set_xlabel('Gamma (γ)', fontweight='bold')
         ax1.set_ylabel('Number of Escape Edges', fontweight='bold')
         ax1.set_title('Escape Edges vs Gamma', fontweight='bold')
@@ -971,12 +1268,8 @@ CHART EXPLANATION:
         ax1.set_xscale('log')
         
         # Plot 2: Flow efficiency
-        flow_efficiency = []
-        for _, row in df.iterrows():
-            edges = row.get('escape_edges_count', 0)
-            violations = row['violations_count']
-            efficiency = (violations / edges * 100) if edges > 0 else 0
-            flow_efficiency.append(efficiency)
+        violations = df['violations_count'].to_numpy()
+        flow_efficiency = np.where(edges > 0, violations / np.maximum(edges, 1) * 100, 0.0)
         
         ax2.bar(range(len(df)), flow_efficiency, color='#4ECDC4', alpha=0.7,
                edgecolor='black', linewidth=1)
@@ -984,170 +1277,144 @@ CHART EXPLANATION:
         ax2.set_ylabel('Flow Efficiency (%)', fontweight='bold')
         ax2.set_title('Escape Edge Utilization', fontweight='bold')
         ax2.set_xticks(range(len(df)))
-        ax2.set_xticklabels([f'γ={g}' for g in df['gamma']], rotation=45)
+        ax2.set_xticklabels(_gamma_tick_labels(df), rotation=45)
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        
         # Save chart
         chart_file = os.path.join(self.dirs['charts'], f"escape_edge_analysis_{self.timestamp}")
         
-        for fmt in self.config['output_formats']:
-            chart_path = f"{chart_file}.{fmt}"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            print(f"📊 Escape edge chart saved: {chart_path}")
+        self._save_chart(fig, chart_file, "📊 Escape edge chart saved")
         
-        plt.close()
+        fig.clf()
         return f"{chart_file}.png"
     
     # =============================================================================
     # REPORTING AND DOCUMENTATION
     # =============================================================================
     
-    def generate_comprehensive_report(self, results: List[Dict]) -> str:
+    def generate_comprehensive_report(self, df: pd.DataFrame) -> str:
         """
         📋 Generate comprehensive gamma analysis report in professional English.
         """
         report_file = os.path.join(self.dirs['reports'], f"gamma_analysis_report_{self.timestamp}.md")
         
+        # Collect the report in memory and write it with a single call
+        parts = []
+        parts.append(f"# 🎯 GAMMA CONTROL ANALYSIS REPORT\n\n")
+        parts.append(f"**🔬 Experiment:** {self.experiment_name}\n")
+        parts.append(f"**📅 Date:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+        parts.append(f"**⚙️ Mode:** {'Real Simulation' if REAL_SIMULATION_AVAILABLE else 'Demonstration Mode'}\n")
+        parts.append(f"**🎯 Target Escape Edge:** {self.target_escape_edge if self.target_escape_edge else 'All edges'}\n")
+        parts.append(f"**📄 DIMACS File:** {self.dimacs_file}\n\n")
+        
+        parts.append(f"## 📊 EXECUTIVE SUMMARY\n\n")
+        if not df.empty:
+            # Calculate important metrics
+            gamma_range = f"{df['gamma'].min()} - {df['gamma'].max()}"
+            total_tests = len(df)
+            
+            total_violations = df['violations_count'].sum()
+            optimal_gamma = df.loc[df['violations_count'].idxmin(), 'gamma']
+            max_penalty = df['penalty_cost'].max()
+            
+            parts.append(f"- **🎯 Gamma range tested:** {gamma_range}\n")
+            parts.append(f"- **🧪 Total tests:** {total_tests}\n")
+            parts.append(f"- **🚨 Total violations detected:** {total_violations}\n")
+            parts.append(f"- **💰 Maximum penalty cost:** {max_penalty:,.0f}\n")
+            parts.append(f"- **⭐ Optimal gamma (fewest violations):** {optimal_gamma}\n\n")
+        
+        parts.append(f"## 🔥 GAMMA CONTROL EFFECT\n\n")
+        parts.append(f"The gamma penalty mechanism demonstrates clear violation control capability:\n\n")
+        
+        for row in _results_to_array(df):
+            status_icon = "🚨" if row['violation'] else "✅"
+            parts.append(f"- **{status_icon} γ = {row['gamma']:g}:** {row['violations']} violations, ")
+            parts.append(f"flow: {row['flow']}, penalty cost: {row['penalty_cost']:,.0f}\n")
+        
+        parts.append(f"\n## 💡 IN-DEPTH ANALYSIS\n\n")
+        
+        parts.append(f"### 🎯 Escape Edge Analysis\n")
+        if self.target_escape_edge:
+            source, dest = self.target_escape_edge
+            parts.append(f"Analysis focused on escape edge **{source} → {dest}**:\n\n")
+            parts.append(f"- This edge represents a 'safety valve' in the system\n")
+            parts.append(f"- When gamma is low: AGVs 'accept' violations because penalty is cheap\n")
+            parts.append(f"- When gamma is high: AGVs avoid violations because penalty is expensive\n")
+            parts.append(f"- Smart design: Allows controlled violations when necessary\n\n")
+        else:
+            parts.append(f"General analysis of all escape edges in the system.\n\n")
+        
+        parts.append(f"### 📈 Gamma-Violations Relationship\n")
+        parts.append(f"The chart shows a clear inverse relationship:\n\n")
+        parts.append(f"1. **Low gamma (γ ≤ 10):** Many violations due to 'cheap' penalty\n")
+        parts.append(f"2. **Medium gamma (10 < γ ≤ 100):** Balance between efficiency and compliance\n")
+        parts.append(f"3. **High gamma (γ > 100):** Few violations due to 'expensive' penalty\n")
+        parts.append(f"4. **Sweet spot:** Optimal gamma at cost-benefit balance point\n\n")
+        
+        parts.append(f"### 🌊 Flow Value Explanation\n")
+        parts.append(f"Flow values can exceed the number of AGVs because:\n\n")
+        parts.append(f"- **Multiple violations:** Many AGVs violate the same restriction\n")
+        parts.append(f"- **Repeated violations:** AGVs violate multiple times in different time windows\n")
+        parts.append(f"- **Cumulative intensity:** Flow represents total violation intensity across time and space\n")
+        parts.append(f"- **Escape edge mechanism:** 'Relief valve' mechanism allows controlled violations\n\n")
+        
+        parts.append(f"## 🛠️ TECHNICAL DETAILS\n\n")
+        parts.append(f"### 🔍 Escape Edge Detection Method\n")
+        parts.append(f"- **Pattern matching:** Find edges with high gamma costs in DIMACS file\n")
+        parts.append(f"- **Node analysis:** Identify virtual nodes (usually ID > 80)\n")
+        parts.append(f"- **Cost threshold:** Edges with cost ≥ 200 or cost > 50 for virtual nodes\n")
+        parts.append(f"- **Flow measurement:** Use NetworkX to measure actual flow through edges\n\n")
+        
+        parts.append(f"### ⚡ Gamma Control Mechanism\n")
+        parts.append(f"```\n")
+        parts.append(f"Penalty Cost = Flow × Gamma\n")
+        parts.append(f"Decision Logic: if (penalty_cost > compliance_cost) then avoid_violation\n")
+        parts.append(f"Control Effect: Higher Gamma → Higher Penalty → Fewer Violations\n")
+        parts.append(f"```\n\n")
+        
+        parts.append(f"### 📊 Measured Metrics\n")
+        parts.append(f"- **Violations Count:** Number of actual violations\n")
+        parts.append(f"- **Flow Value:** Flow intensity through escape edge\n")
+        parts.append(f"- **Penalty Cost:** Penalty cost calculated as Flow × Gamma\n")
+        parts.append(f"- **Control Effectiveness:** Control efficiency as percentage\n\n")
+        
+        parts.append(f"## 🎯 CONCLUSIONS AND RECOMMENDATIONS\n\n")
+        parts.append(f"### ✅ Key Conclusions\n")
+        parts.append(f"1. **Effective gamma control:** Provides powerful 'control knob' for efficiency-compliance balance\n")
+        parts.append(f"2. **Smart escape edges:** Act as 'safety valves' allowing controlled violations\n")
+        parts.append(f"3. **Clear relationship:** High gamma → high penalty → few violations\n")
+        parts.append(f"4. **Flexibility:** System designers can tune gamma to achieve desired balance\n\n")
+        
+        parts.append(f"### 🚀 Implementation Recommendations\n")
+        if not df.empty:
+            optimal_gamma = df.loc[df['violations_count'].idxmin(), 'gamma']
+            parts.append(f"- **Recommended gamma:** {optimal_gamma} (based on experimental results)\n")
+        parts.append(f"- **Monitoring:** Continuously track violations and penalty costs\n")
+        parts.append(f"- **Adaptive tuning:** Adjust gamma according to actual operating conditions\n")
+        parts.append(f"- **Safety mechanism:** Maintain escape edges as backup for emergency situations\n\n")
+        
+        parts.append(f"### 📈 Future Development\n")
+        parts.append(f"- **Dynamic gamma:** Self-adjusting gamma based on traffic load\n")
+        parts.append(f"- **Multi-level control:** Different gamma values for each restriction type\n")
+        parts.append(f"- **Machine learning:** Learn optimal gamma from historical data\n")
+        parts.append(f"- **Real-time optimization:** Optimize gamma during runtime\n\n")
+        
+        parts.append(f"---\n")
+        parts.append(f"*Report automatically generated by Master Gamma Analyzer v2.0*\n")
+        parts.append(f"*Timestamp: {self.timestamp}*\n")
+        
         with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(f"# 🎯 GAMMA CONTROL ANALYSIS REPORT\n\n")
-            f.write(f"**🔬 Experiment:** {self.experiment_name}\n")
-            f.write(f"**📅 Date:** {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-            f.write(f"**⚙️ Mode:** {'Real Simulation' if REAL_SIMULATION_AVAILABLE else 'Demonstration Mode'}\n")
-            f.write(f"**🎯 Target Escape Edge:** {self.target_escape_edge if self.target_escape_edge else 'All edges'}\n")
-            f.write(f"**📄 DIMACS File:** {self.dimacs_file}\n\n")
-            
-            f.write(f"## 📊 EXECUTIVE SUMMARY\n\n")
-            if results:
-                df = pd.DataFrame(results)
-                
-                # Calculate important metrics
-                gamma_range = f"{df['gamma'].min()} - {df['gamma'].max()}"
-                total_tests = len(results)
-                
-                if 'violations_count' in df.columns:
-                    total_violations = df['violations_count'].sum()
-                    optimal_gamma = df.loc[df['violations_count'].idxmin(), 'gamma']
-                elif 'has_violation' in df.columns:
-                    total_violations = sum(df['has_violation'])
-                    optimal_gamma = df.loc[~df['has_violation'], 'gamma'].iloc[0] if any(~df['has_violation']) else df['gamma'].iloc[-1]
-                else:
-                    total_violations = 0
-                    optimal_gamma = df['gamma'].iloc[-1]
-                
-                penalty_costs = df.get('penalty_cost', df.get('total_penalty_cost', [0]*len(df)))
-                max_penalty = max(penalty_costs)
-                
-                f.write(f"- **🎯 Gamma range tested:** {gamma_range}\n")
-                f.write(f"- **🧪 Total tests:** {total_tests}\n")
-                f.write(f"- **🚨 Total violations detected:** {total_violations}\n")
-                f.write(f"- **💰 Maximum penalty cost:** {max_penalty:,.0f}\n")
-                f.write(f"- **⭐ Optimal gamma (fewest violations):** {optimal_gamma}\n\n")
-            
-            f.write(f"## 🔥 GAMMA CONTROL EFFECT\n\n")
-            f.write(f"The gamma penalty mechanism demonstrates clear violation control capability:\n\n")
-            
-            for result in results:
-                gamma = result['gamma']
-                
-                if 'violations_count' in result:
-                    violations = result['violations_count']
-                    flow = result.get('flow_value', result.get('total_violation_flow', 0))
-                    cost = result.get('penalty_cost', result.get('total_penalty_cost', 0))
-                elif 'has_violation' in result:
-                    violations = 1 if result['has_violation'] else 0
-                    flow = result.get('flow_value', 0)
-                    cost = result.get('penalty_cost', 0)
-                else:
-                    violations = 0
-                    flow = 0
-                    cost = 0
-                
-                status_icon = "🚨" if violations > 0 else "✅"
-                f.write(f"- **{status_icon} γ = {gamma}:** {violations} violations, ")
-                f.write(f"flow: {flow}, penalty cost: {cost:,.0f}\n")
-            
-            f.write(f"\n## 💡 IN-DEPTH ANALYSIS\n\n")
-            
-            f.write(f"### 🎯 Escape Edge Analysis\n")
-            if self.target_escape_edge:
-                source, dest = self.target_escape_edge
-                f.write(f"Analysis focused on escape edge **{source} → {dest}**:\n\n")
-                f.write(f"- This edge represents a 'safety valve' in the system\n")
-                f.write(f"- When gamma is low: AGVs 'accept' violations because penalty is cheap\n")
-                f.write(f"- When gamma is high: AGVs avoid violations because penalty is expensive\n")
-                f.write(f"- Smart design: Allows controlled violations when necessary\n\n")
-            else:
-                f.write(f"General analysis of all escape edges in the system.\n\n")
-            
-            f.write(f"### 📈 Gamma-Violations Relationship\n")
-            f.write(f"The chart shows a clear inverse relationship:\n\n")
-            f.write(f"1. **Low gamma (γ ≤ 10):** Many violations due to 'cheap' penalty\n")
-            f.write(f"2. **Medium gamma (10 < γ ≤ 100):** Balance between efficiency and compliance\n")
-            f.write(f"3. **High gamma (γ > 100):** Few violations due to 'expensive' penalty\n")
-            f.write(f"4. **Sweet spot:** Optimal gamma at cost-benefit balance point\n\n")
-            
-            f.write(f"### 🌊 Flow Value Explanation\n")
-            f.write(f"Flow values can exceed the number of AGVs because:\n\n")
-            f.write(f"- **Multiple violations:** Many AGVs violate the same restriction\n")
-            f.write(f"- **Repeated violations:** AGVs violate multiple times in different time windows\n")
-            f.write(f"- **Cumulative intensity:** Flow represents total violation intensity across time and space\n")
-            f.write(f"- **Escape edge mechanism:** 'Relief valve' mechanism allows controlled violations\n\n")
-            
-            f.write(f"## 🛠️ TECHNICAL DETAILS\n\n")
-            f.write(f"### 🔍 Escape Edge Detection Method\n")
-            f.write(f"- **Pattern matching:** Find edges with high gamma costs in DIMACS file\n")
-            f.write(f"- **Node analysis:** Identify virtual nodes (usually ID > 80)\n")
-            f.write(f"- **Cost threshold:** Edges with cost ≥ 200 or cost > 50 for virtual nodes\n")
-            f.write(f"- **Flow measurement:** Use NetworkX to measure actual flow through edges\n\n")
-            
-            f.write(f"### ⚡ Gamma Control Mechanism\n")
-            f.write(f"```\n")
-            f.write(f"Penalty Cost = Flow × Gamma\n")
-            f.write(f"Decision Logic: if (penalty_cost > compliance_cost) then avoid_violation\n")
-            f.write(f"Control Effect: Higher Gamma → Higher Penalty → Fewer Violations\n")
-            f.write(f"```\n\n")
-            
-            f.write(f"### 📊 Measured Metrics\n")
-            f.write(f"- **Violations Count:** Number of actual violations\n")
-            f.write(f"- **Flow Value:** Flow intensity through escape edge\n")
-            f.write(f"- **Penalty Cost:** Penalty cost calculated as Flow × Gamma\n")
-            f.write(f"- **Control Effectiveness:** Control efficiency as percentage\n\n")
-            
-            f.write(f"## 🎯 CONCLUSIONS AND RECOMMENDATIONS\n\n")
-            f.write(f"### ✅ Key Conclusions\n")
-            f.write(f"1. **Effective gamma control:** Provides powerful 'control knob' for efficiency-compliance balance\n")
-            f.write(f"2. **Smart escape edges:** Act as 'safety valves' allowing controlled violations\n")
-            f.write(f"3. **Clear relationship:** High gamma → high penalty → few violations\n")
-            f.write(f"4. **Flexibility:** System designers can tune gamma to achieve desired balance\n\n")
-            
-            f.write(f"### 🚀 Implementation Recommendations\n")
-            if results:
-                optimal_gamma = df.loc[df.get('violations_count', df.get('has_violation', [0]*len(df))).idxmin(), 'gamma']
-                f.write(f"- **Recommended gamma:** {optimal_gamma} (based on experimental results)\n")
-            f.write(f"- **Monitoring:** Continuously track violations and penalty costs\n")
-            f.write(f"- **Adaptive tuning:** Adjust gamma according to actual operating conditions\n")
-            f.write(f"- **Safety mechanism:** Maintain escape edges as backup for emergency situations\n\n")
-            
-            f.write(f"### 📈 Future Development\n")
-            f.write(f"- **Dynamic gamma:** Self-adjusting gamma based on traffic load\n")
-            f.write(f"- **Multi-level control:** Different gamma values for each restriction type\n")
-            f.write(f"- **Machine learning:** Learn optimal gamma from historical data\n")
-            f.write(f"- **Real-time optimization:** Optimize gamma during runtime\n\n")
-            
-            f.write(f"---\n")
-            f.write(f"*Report automatically generated by Master Gamma Analyzer v2.0*\n")
-            f.write(f"*Timestamp: {self.timestamp}*\n")
+            f.write(''.join(parts))
         
         print(f"📋 Comprehensive report generated: {report_file}")
         return report_file
     
-    def save_experiment_data(self, results: List[Dict]) -> str:
+    def save_experiment_data(self, results: List[Dict], df: Optional[pd.DataFrame] = None) -> str:
         """
-        Save experiment data to JSON and CSV formats.
+        Save experiment data to JSON and CSV formats (plus Parquet when pyarrow is available).
+        The CSV is written from df when given, else from a DataFrame of results.
         """
-        # Save as JSON
+        # Save as compact JSON; NumPy scalars and other non-JSON values fall back to str
         json_file = os.path.join(self.dirs['data'], f"gamma_experiment_data_{self.timestamp}.json")
         with open(json_file, 'w') as f:
             json.dump({
@@ -1155,27 +1422,34 @@ CHART EXPLANATION:
                 'timestamp': self.timestamp,
                 'config': self.config,
                 'results': results
-            }, f, indent=2)
+            }, f, separators=(',', ':'), default=str)
         
         # Save as CSV
         csv_file = os.path.join(self.dirs['data'], f"gamma_experiment_data_{self.timestamp}.csv")
-        df = pd.DataFrame(results)
-        df.to_csv(csv_file, index=False)
+        if df is None:
+            df = pd.DataFrame(results)
+        df.to_csv(csv_file, index=False, lineterminator='\n')
         
         print(f"💾 Data saved: {json_file}")
         print(f"💾 Data saved: {csv_file}")
         
+        # Save as Parquet (columnar and compressed) if pyarrow is installed
+        if PYARROW_AVAILABLE:
+            parquet_file = os.path.join(self.dirs['data'], f"gamma_experiment_data_{self.timestamp}.parquet")
+            df.to_parquet(parquet_file, index=False)
+            print(f"💾 Data saved: {parquet_file}")
+        
         return json_file
     
     # =============================================================================
     # HELPER FUNCTIONS
     # =============================================================================
     
-    def print_analysis_summary(self, results: List[Dict]):
+    def print_analysis_summary(self, df: pd.DataFrame):
         """
         📋 Print analysis results summary with beautiful formatting.
         """
-        if not results:
+        if df.empty:
             return
             
         print(f"\n{'='*60}")
@@ -1185,40 +1459,31 @@ CHART EXPLANATION:
         # Basic info
         print(f"🎯 Target Edge: {self.target_escape_edge if self.target_escape_edge else 'All edges'}")
         print(f"📄 DIMACS File: {self.dimacs_file}")
-        print(f"🧪 Number of tests: {len(results)}")
+        print(f"🧪 Number of tests: {len(df)}")
+        
+        table = _results_to_array(df)
         
         # Gamma range
-        gamma_values = [r['gamma'] for r in results]
-        print(f"🔢 Gamma range: {min(gamma_values)} - {max(gamma_values)}")
+        print(f"🔢 Gamma range: {table['gamma'].min():g} - {table['gamma'].max():g}")
         
         # Violations summary
-        violations = [r.get('violations_count', 1 if r.get('has_violation') else 0) for r in results]
-        total_violations = sum(violations)
-        print(f"🚨 Total violations: {total_violations}")
+        print(f"🚨 Total violations: {table['violations'].sum()}")
         
         # Penalty costs
-        penalty_costs = [r.get('penalty_cost', r.get('total_penalty_cost', 0)) for r in results]
-        max_penalty = max(penalty_costs)
-        print(f"💰 Max penalty cost: {max_penalty:,.0f}")
+        print(f"💰 Max penalty cost: {table['penalty_cost'].max():,.0f}")
         
         # Optimal gamma
-        min_violations_idx = violations.index(min(violations))
-        optimal_gamma = results[min_violations_idx]['gamma']
-        print(f"⭐ Optimal gamma: {optimal_gamma} (fewest violations)")
+        optimal_gamma = table['gamma'][table['violations'].argmin()]
+        print(f"⭐ Optimal gamma: {optimal_gamma:g} (fewest violations)")
         
         print(f"\n📊 DETAILED RESULTS:")
         print(f"{'-'*60}")
         print(f"{'Gamma':>8} | {'Violations':>10} | {'Flow':>8} | {'Penalty Cost':>15}")
         print(f"{'-'*60}")
         
-        for result in results:
-            gamma = result['gamma']
-            violations = result.get('violations_count', 1 if result.get('has_violation') else 0)
-            flow = result.get('flow_value', result.get('total_violation_flow', 0))
-            cost = result.get('penalty_cost', result.get('total_penalty_cost', 0))
-            
-            status_icon = "🚨" if violations > 0 else "✅"
-            print(f"{gamma:>8} | {violations:>10} | {flow:>8} | {cost:>15,.0f} {status_icon}")
+        for row in table:
+            status_icon = "🚨" if row['violation'] else "✅"
+            print(f"{row['gamma']:>8g} | {row['violations']:>10} | {row['flow']:>8} | {row['penalty_cost']:>15,.0f} {status_icon}")
         
         print(f"{'-'*60}")
         print()
@@ -1248,31 +1513,39 @@ CHART EXPLANATION:
             print("❌ No results generated")
             return {}
         
+        # One normalized DataFrame shared by every chart, the report and the summary
+        df = _normalize_results(self.results_df)
+        
         # Create professional visualizations
         print(f"\n📊 CREATING PROFESSIONAL CHARTS")
         print(f"{'-'*45}")
         
-        # Most important chart: Gamma vs Violations
-        main_chart = self.create_gamma_violation_relationship_chart(results)
-        
-        # Penalty cost analysis chart
-        cost_chart = self.create_penalty_cost_analysis_chart(results)
-        
-        # Flow dynamics chart
-        flow_chart = self.create_flow_dynamics_chart(results)
+        # Each chart draws its own figure, so the three render concurrently; the
+        # PNG/PDF encoding they spend most of their time in releases the GIL
+        _pyplot(self.config['mpl_style'])
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            chart_futures = [
+                # Most important chart: Gamma vs Violations
+                executor.submit(self.create_gamma_violation_relationship_chart, df),
+                # Penalty cost analysis chart
+                executor.submit(self.create_penalty_cost_analysis_chart, df),
+                # Flow dynamics chart
+                executor.submit(self.create_flow_dynamics_chart, df)
+            ]
+            main_chart, cost_chart, flow_chart = [future.result() for future in chart_futures]
         
         # Generate report
         print(f"\n📋 GENERATING COMPREHENSIVE REPORT")
         print(f"{'-'*30}")
-        report_file = self.generate_comprehensive_report(results)
+        report_file = self.generate_comprehensive_report(df)
         
         # Save data
         print(f"\n💾 SAVING EXPERIMENT DATA")
         print(f"{'-'*25}")
-        data_file = self.save_experiment_data(results)
+        data_file = self.save_experiment_data(results, self.results_df)
         
         # Results summary
-        self.print_analysis_summary(results)
+        self.print_analysis_summary(df)
         
         # Final success message
         print(f"\n✨ ANALYSIS COMPLETED SUCCESSFULLY!")
@@ -1296,6 +1569,10 @@ CHART EXPLANATION:
         """
         Modify gamma (cost) value for a specific escape edge in TSG.txt file.
         
+        The arc lines are rewritten with one regex pass over the file bytes,
+        written to a temporary file and atomically swapped in, so the file is
+        never left half-written.
+        
         Args:
             tsg_file: Path to TSG.txt file
             source: Source node of escape edge
@@ -1305,80 +1582,46 @@ CHART EXPLANATION:
         Returns:
             True if modification successful, False otherwise
         """
+        tmp_file = f"{tsg_file}.tmp"
         try:
             print(f"  🔧 Modifying edge {source}→{dest} gamma to {new_gamma}")
             
-            # Read all lines from TSG file
-            with open(tsg_file, 'r') as file:
-                lines = file.readlines()
-            
             modified = False
-            modified_lines = []
             
-            # Process each line
-            for line in lines:
-                if line.startswith('a '):
-                    parts = line.strip().split()
-                    if len(parts) >= 6:
-                        edge_source = int(parts[1])
-                        edge_dest = int(parts[2])
-                        lower_bound = parts[3]
-                        capacity = parts[4]
-                        old_cost = parts[5]
-                        
-                        # Check if this is our target edge
-                        if edge_source == source and edge_dest == dest:
-                            # Modify the cost (gamma)
-                            new_line = f"a {source} {dest} {lower_bound} {capacity} {int(new_gamma)}\n"
-                            modified_lines.append(new_line)
-                            print(f"    ✏️  Modified: {line.strip()} → a {source} {dest} {lower_bound} {capacity} {int(new_gamma)}")
-                            modified = True
-                        else:
-                            modified_lines.append(line)
-                    else:
-                        modified_lines.append(line)
-                else:
-                    modified_lines.append(line)
+            def replace_cost(match):
+                nonlocal modified
+                # Check if this is our target edge
+                if int(match.group(1)) != source or int(match.group(2)) != dest:
+                    return match.group(0)
+                # Modify the cost (gamma)
+                new_line = b'a %d %d %s %s %d' % (source, dest, match.group(3), match.group(4), int(new_gamma))
+                print(f"    ✏️  Modified: {match.group(0).decode()} → {new_line.decode()}")
+                modified = True
+                return new_line
+            
+            # One regex pass over the whole file, written back in a single write
+            mm = self._tsg_mmap(tsg_file)
+            data = _A_LINE_RE.sub(replace_cost, mm) if mm is not None else b''
             
             if not modified:
                 print(f"    ⚠️  Edge {source}→{dest} not found in TSG file")
                 return False
             
-            # Write modified content back to file
-            with open(tsg_file, 'w') as file:
-                file.writelines(modified_lines)
+            # Swap the modified content in place of the original file
+            with open(tmp_file, 'wb') as fout:
+                fout.write(data)
+            os.replace(tmp_file, tsg_file)
+            self._invalidate_dimacs_cache(tsg_file)
             
             print(f"    ✅ Successfully modified gamma for edge {source}→{dest}")
             return True
             
         except Exception as e:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
             print(f"    ❌ Error modifying TSG file: {e}")
             return False
 
-    def restore_tsg_backup(self, backup_file: str, original_file: str = "TSG.txt") -> bool:
-        """
-        Restore TSG.txt from backup file.
-        
-        Args:
-            backup_file: Path to backup file
-            original_file: Path to original file to restore
-            
-        Returns:
-            True if restoration successful, False otherwise
-        """
-        try:
-            if os.path.exists(backup_file):
-                import shutil
-                shutil.copy2(backup_file, original_file)
-                print(f"  🔄 Restored {original_file} from {backup_file}")
-                return True
-            else:
-                print(f"  ⚠️  Backup file {backup_file} not found")
-                return False
-        except Exception as e:
-            print(f"  ❌ Error restoring backup: {e}")
-            return False
-
 # =============================================================================
 # COMMAND LINE INTERFACE
 # =============================================================================
@@ -1431,23 +1674,24 @@ def parse_arguments():
     # Advanced options
     parser.add_argument('--config', type=str,
                        help='⚙️ Path to configuration file')
+    parser.add_argument('--quiet', action='store_true',
+                       help='🔇 Only print summaries, not per-gamma progress')
     
     return parser.parse_args()
 
-def main():
-    """🚀 Main execution function with enhanced interface."""
-    print("🎯 MASTER GAMMA ESCAPE EDGE ANALYSIS TOOL")
-    print("=" * 60)
-    print("🔬 Professional analysis tool for gamma control")
-    print("📊 Support for specific escape edge and DIMACS file analysis")
-    print("=" * 60)
-    
-    args = parse_arguments()
-    
+def run_analysis(escape_edge: Optional[Tuple[int, int]] = None, gamma_values: Optional[List[float]] = None,
+                 dimacs_file: str = "TSG.txt", demo: bool = False, real: bool = False,
+                 output_dir: str = "output", experiment_name: Optional[str] = None,
+                 config_file: Optional[str] = None, quiet: bool = False) -> Optional[Dict[str, str]]:
+    """
+    🚀 Run a complete gamma analysis without going through argparse.
+
+    Programmatic entry point; main() parses the command line and delegates here.
+    Returns the run_complete_analysis result dict.
+    """
     # Validate escape edge input - Default to 81->82 if not specified
-    escape_edge = None
-    if args.escape_edge:
-        source, dest = args.escape_edge
+    if escape_edge:
+        source, dest = escape_edge
         escape_edge = (source, dest)
         print(f"🎯 Target Escape Edge: {source} → {dest}")
     else:
@@ -1456,31 +1700,24 @@ def main():
         print(f"🎯 Target Escape Edge: 81 → 82 (default)")
     
     # Validate DIMACS file - Default to TSG.txt
-    dimacs_file = args.dimacs_file
-    if not os.path.exists(dimacs_file) and not args.demo:
+    if not os.path.exists(dimacs_file) and not demo:
         print(f"⚠️  DIMACS file does not exist: {dimacs_file}")
         print(f"💡 Use --demo to run with simulated data")
     
-    # Parse gamma values
-    if args.gamma_values:
-        try:
-            gamma_values = [float(x.strip()) for x in args.gamma_values.split(',')]
-            print(f"🔢 Gamma values: {gamma_values}")
-        except ValueError:
-            print("❌ Invalid gamma values format. Use: 1,10,50,100")
-            return
+    if gamma_values:
+        print(f"🔢 Gamma values: {gamma_values}")
     else:
         gamma_values = None
         print(f"🔢 Using default gamma values")
     
     # Determine simulation mode
-    use_real_simulation = args.real and REAL_SIMULATION_AVAILABLE
-    if args.real and not REAL_SIMULATION_AVAILABLE:
+    use_real_simulation = real and REAL_SIMULATION_AVAILABLE
+    if real and not REAL_SIMULATION_AVAILABLE:
         print("⚠️  Real simulation requested but not available.")
         print("🎭 Switching to demo mode.")
-        args.demo = True
+        demo = True
     
-    if args.demo:
+    if demo:
         print("🎭 Mode: DEMONSTRATION MODE")
     elif use_real_simulation:
         print("🚀 Mode: REAL SIMULATION MODE")
@@ -1491,25 +1728,25 @@ def main():
     
     # Create analyzer with enhanced configuration
     analyzer = MasterGammaAnalyzer(
-        output_dir=args.output_dir,
-        experiment_name=args.experiment_name,
+        output_dir=output_dir,
+        experiment_name=experiment_name,
         escape_edge=escape_edge,
-        dimacs_file=dimacs_file
+        dimacs_file=dimacs_file,
+        quiet=quiet
     )
     
     # Load custom config if available
-    if args.config and os.path.exists(args.config):
+    if config_file and os.path.exists(config_file):
         try:
-            import json
-            with open(args.config, 'r') as f:
+            with open(config_file, 'r') as f:
                 custom_config = json.load(f)
                 analyzer.config.update(custom_config)
-                print(f"📋 Loaded custom config: {args.config}")
+                print(f"📋 Loaded custom config: {config_file}")
         except Exception as e:
             print(f"⚠️  Failed to load config: {e}")
     
     # Quick validation for specific escape edge if real file exists
-    if escape_edge and os.path.exists(dimacs_file) and not args.demo:
+    if escape_edge and os.path.exists(dimacs_file) and not demo:
         print(f"🔍 CHECKING ESCAPE EDGE IN FILE...")
         source, dest = escape_edge
         edge_info = analyzer.find_specific_escape_edge(source, dest, dimacs_file)
@@ -1517,11 +1754,42 @@ def main():
             print(f"❌ Escape edge {source} → {dest} not found in {dimacs_file}")
             print(f"💡 You can still run demo mode with --demo")
             print(f"🎭 Switching to demo mode automatically...")
-            args.demo = True
+            demo = True
     
     # Run analysis
     print(f"\n🚀 STARTING ANALYSIS...")
-    results = analyzer.run_complete_analysis(gamma_values, use_real_simulation or not args.demo)
+    return analyzer.run_complete_analysis(gamma_values, use_real_simulation or not demo)
+
+def main():
+    """🚀 Main execution function with enhanced interface."""
+    print("🎯 MASTER GAMMA ESCAPE EDGE ANALYSIS TOOL")
+    print("=" * 60)
+    print("🔬 Professional analysis tool for gamma control")
+    print("📊 Support for specific escape edge and DIMACS file analysis")
+    print("=" * 60)
+    
+    args = parse_arguments()
+    
+    # Parse gamma values
+    gamma_values = None
+    if args.gamma_values:
+        try:
+            gamma_values = [float(x.strip()) for x in args.gamma_values.split(',')]
+        except ValueError:
+            print("❌ Invalid gamma values format. Use: 1,10,50,100")
+            return
+    
+    results = run_analysis(
+        escape_edge=tuple(args.escape_edge) if args.escape_edge else None,
+        gamma_values=gamma_values,
+        dimacs_file=args.dimacs_file,
+        demo=args.demo,
+        real=args.real,
+        output_dir=args.output_dir,
+        experiment_name=args.experiment_name,
+        config_file=args.config,
+        quiet=args.quiet
+    )
     
     if results:
         print(f"\n🎉 SUCCESS! Analysis completed.")
@@ -18,6 +18,7 @@ class AGV:
         self.version_of_graph = version_of_graph
         self._traces = [] #các đỉnh sắp đi qua
         self._path = SortedSet([]) #các đỉnh đã đi qua 
+        self.path_history = [] #các bước {node, time} của hành trình, ghi lại khi AGV kết thúc
         self.graph = graph
         if current_node not in self.graph.nodes.keys():
             #pdb.set_trace()
@@ -1,19 +1,186 @@
+import io
+import re
 import networkx as nx
-import pdb
+import numpy as np
 import config
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+# Optional JIT for the write_trace cost kernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import pyMCFSimplex
+    MCFSIMPLEX_AVAILABLE = True
+except ImportError:
+    MCFSIMPLEX_AVAILABLE = False
+
+try:
+    from ortools.graph.python import min_cost_flow
+    ORTOOLS_AVAILABLE = True
+except ImportError:
+    ORTOOLS_AVAILABLE = False
+
+# Whole 'a ...' arc lines of a DIMACS file, newline included
+_ARC_LINES_RE = re.compile(rb'^a .*(?:\n|$)', re.MULTILINE)
+
+# Empty cost table: every (s, t) lookup falls outside it
+_NO_COST_LUT = np.full((0, 0), -1, dtype=np.int64)
+# Below this share of (s, t) cells populated, space-edge costs are kept as sorted keys instead
+_DENSE_COST_LUT_MIN_FILL = 0.1
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _trace_results(s, inner, values, M, cost_lut):
+        """Return values * cost_lut[s, t] (cost -1 outside the table), with t = inner // M or M."""
+        results = np.empty(s.shape[0], dtype=np.int64)
+        rows, cols = cost_lut.shape
+        for i in range(s.shape[0]):
+            t = inner[i] // M
+            if t == 0:
+                t = M
+            cost = -1
+            if s[i] < rows and t < cols:
+                cost = cost_lut[s[i], t]
+            results[i] = values[i] * cost
+        return results
+else:
+    def _trace_results(s, inner, values, M, cost_lut):
+        """Return values * cost_lut[s, t] (cost -1 outside the table), with t = inner // M or M."""
+        t = inner // M
+        t[t == 0] = M
+        costs = np.full(len(s), -1, dtype=np.int64)
+        # Pairs outside the table have no space edge and keep the -1 sentinel
+        known = (s < cost_lut.shape[0]) & (t < cost_lut.shape[1])
+        costs[known] = cost_lut[s[known], t[known]]
+        return values * costs
+
+def _sparse_trace_results(s, inner, values, M, cost_index):
+    """_trace_results for a sparse cost table: (cols, sorted s*cols+t keys, their costs)."""
+    cols, keys, costs = cost_index
+    t = inner // M
+    t[t == 0] = M
+    codes = s*cols + t
+    pos = np.minimum(np.searchsorted(keys, codes), len(keys) - 1)
+    # Pairs with no space edge keep the -1 sentinel
+    found = (t < cols) & (keys[pos] == codes)
+    return values * np.where(found, costs[pos], -1)
+
+class FlowProblem:
+    """
+    Min cost flow input as parallel arrays (one entry per arc / per node) for the
+    native solvers, with node IDs mapped to 0-based indices once.
+    """
+    def __init__(self, nodes, tail, head, cap, cost, supply):
+        self.nodes = nodes      # index -> node ID
+        self.tail = tail        # arc source index
+        self.head = head        # arc target index
+        self.cap = cap
+        self.cost = cost
+        self.supply = supply    # positive at sources (the negated NetworkX demand)
+
+    @classmethod
+    def from_graph(cls, G):
+        """Flatten G, or return None when it has non-integer or uncapacitated edges (left to nx.network_simplex)."""
+        nodes = list(G.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        m = G.number_of_edges()
+        tail = np.empty(m, dtype=np.int64)
+        head = np.empty(m, dtype=np.int64)
+        cap = np.empty(m, dtype=np.int64)
+        cost = np.empty(m, dtype=np.int64)
+        for i, (u, v, data) in enumerate(G.edges(data=True)):
+            capacity, weight = data.get('capacity'), data.get('weight', 0)
+            if not isinstance(capacity, int) or not isinstance(weight, int):
+                return None
+            tail[i] = index[u]
+            head[i] = index[v]
+            cap[i] = capacity
+            cost[i] = weight
+        supply = np.fromiter((-demand for _, demand in G.nodes(data='demand', default=0)),
+                             dtype=np.int64, count=len(nodes))
+        return cls(nodes, tail, head, cap, cost, supply)
+
+    def with_costs(self, cost):
+        """Same network with another per-arc cost array (the other arrays are shared, not copied)."""
+        return FlowProblem(self.nodes, self.tail, self.head, self.cap, cost, self.supply)
+
+    def arc(self, u, v):
+        """Index of the arc u -> v (the first one, if parallel), or None."""
+        if u not in self.nodes or v not in self.nodes:
+            return None
+        arcs = np.flatnonzero((self.tail == self.nodes.index(u)) & (self.head == self.nodes.index(v)))
+        return int(arcs[0]) if len(arcs) else None
+
+    def flow_dict(self, flows):
+        """Non-zero arc flows as the {source: {dest: flow}} dict nx.network_simplex returns."""
+        nodes, tail, head = self.nodes, self.tail, self.head
+        flowDict = {}
+        # One pass over the carrying arcs only; zero flows never reach a dict
+        arcs = np.flatnonzero(flows)
+        for u, v, flow in zip(tail[arcs].tolist(), head[arcs].tolist(), flows[arcs].tolist()):
+            flowDict.setdefault(nodes[u], {})[nodes[v]] = flow
+        return flowDict
 
 class NetworkXSolution:
+    # graph signature -> 3D spring layout, shared by all instances (a new one is made per solve)
+    _pos_cache = OrderedDict()
+    _POS_CACHE_SIZE = 8
+
     def __init__(self):#, edges_with_costs, startednodes, targetnodes):
         self.startednodes = None #startednodes
         self.targetnodes = None #targetnodes
-        self.edges_with_costs = None #edges_with_costs
+        self.edges_with_costs = None #edges_with_costs (also fills self._cost_lut / self._cost_index)
         self.flowCost = 0
         self.flowDict = defaultdict(list)
+        self._pending_flows = None  # (FlowProblem, flows) from a native solve, expanded into flowDict on first read
         self.M = config.M
+        self._violation_map = {}  # (src, dest) -> n, filled from 'c Edge ... violates' comments
+        self._escape_edges = frozenset()  # (vS_global, vD_global) edges of the current graph
+
+    @property
+    def edges_with_costs(self):
+        return self._edges_with_costs
+
+    @edges_with_costs.setter
+    def edges_with_costs(self, value):
+        # Dense cost table: _cost_lut[s, t] = cost of space edge (s, t), -1 where there is none.
+        # Sparse tables are kept as _cost_index = (cols, sorted s*cols+t keys, their costs)
+        self._edges_with_costs = value
+        self._cost_lut = None
+        self._cost_index = None
+        if value:
+            pairs = np.array(list(value.keys()), dtype=np.int64).reshape(-1, 2)
+            if pairs.min() >= 0:
+                costs = np.array([cost_pair[1] for cost_pair in value.values()], dtype=np.int64)
+                rows, cols = pairs.max(axis=0) + 1
+                if len(pairs) >= _DENSE_COST_LUT_MIN_FILL * rows * cols:
+                    lut = np.full((rows, cols), -1, dtype=np.int64)
+                    lut[pairs[:, 0], pairs[:, 1]] = costs
+                    self._cost_lut = lut
+                else:
+                    keys = pairs[:, 0]*cols + pairs[:, 1]
+                    order = np.argsort(keys)
+                    self._cost_index = (int(cols), keys[order], costs[order])
+
+    @property
+    def flowDict(self):
+        if self._pending_flows is not None:
+            problem, flows = self._pending_flows
+            self._pending_flows = None
+            self._flowDict = problem.flow_dict(flows)
+        return self._flowDict
+
+    @flowDict.setter
+    def flowDict(self, value):
+        self._pending_flows = None
+        self._flowDict = value
+
     def is_artificial_edge(self, edge):
         # Check if either node in the edge is artificial
         node1, node2 = edge
@@ -22,21 +189,8 @@ class NetworkXSolution:
 
     
     def is_restriction_violation(self, edge):
-        """Check if an edge violates any restrictions by looking for violation comments in TSG file."""
-        try:
-            with open('TSG.txt', 'r') as file:
-                for line in file:
-                    if line.startswith('c Edge') and 'violates' in line:
-                        parts = line.strip().split()
-                        if len(parts) >= 6:
-                            source = int(parts[2])
-                            dest = int(parts[3])
-                            n = int(parts[5])
-                            if (str(edge[0]) == str(source) and str(edge[1]) == str(dest)):
-                                return n 
-        except FileNotFoundError:
-            pass
-        return False
+        """Look up the violation count recorded for an edge by a 'c Edge X Y violates N' comment."""
+        return self._violation_map.get((str(edge[0]), str(edge[1])), False)
     
     def is_escape_edge(self, edge):
         """Check if an edge is an escape edge (vS_global to vD_global) based on node labels."""
@@ -48,25 +202,66 @@ class NetworkXSolution:
         except:
             return False
     
+    def _find_escape_edges(self, G):
+        """Collect the (vS_global, vD_global) edges of G once so flow counting is a set lookup."""
+        labels = {node: data.get('label', '') for node, data in G.nodes(data=True)}
+        self._escape_edges = frozenset(
+            (u, v) for u, v in G.edges()
+            if 'Global_vS_Res' in labels[u] and 'Global_vD_Res' in labels[v])
+
     def count_violation_flow(self):
         """Count the total flow through escape edges as violations."""
-        total_violations = 0
-        for source_node, flow_dict in self.flowDict.items():
-            for dest_node, flow_value in flow_dict.items():
-                if flow_value > 0 and self.is_escape_edge((source_node, dest_node)):
-                    total_violations += flow_value
-        return total_violations  
+        escape_edges = self._escape_edges
+        if self._pending_flows is not None:
+            # Straight from the solver's arc flows, without building flowDict
+            problem, flows = self._pending_flows
+            nodes, tail, head = problem.nodes, problem.tail, problem.head
+            return sum(int(flows[arc]) for arc in np.flatnonzero(flows > 0).tolist()
+                       if (nodes[tail[arc]], nodes[head[arc]]) in escape_edges)
+        return sum(flow_value for source_node, flow_dict in self.flowDict.items()
+                   for dest_node, flow_value in flow_dict.items()
+                   if flow_value > 0 and (source_node, dest_node) in escape_edges)
     
+    def _time_expanded_layout(self, G):
+        """
+        Place node k of the time-expanded graph at its space node (k mod M, on a
+        circle) and lift it to its time step on z. O(N), unlike spring_layout;
+        None when M is unknown or node IDs are not numeric.
+        """
+        M = self.M
+        if not M or M <= 0:
+            return None
+        try:
+            ids = [int(node) for node in G.nodes()]
+        except (TypeError, ValueError):
+            return None
+        circle = nx.circular_layout(range(1, M + 1))
+        pos = {}
+        for node, k in zip(G.nodes(), ids):
+            real_node = k % M + (M if k % M == 0 else 0)
+            t = k // M - (1 if k % M == 0 else 0)
+            x, y = circle[real_node]
+            pos[node] = (x, y, t)
+        return pos
+
     def plot_graph_3d_interactive(self, G):
         if(config.draw == 0):
             return
-        pos = nx.spring_layout(G, dim=3)
+        pos = self._time_expanded_layout(G)
+        if pos is None:
+            # Spring layout is the slow part; reuse it while the topology is unchanged
+            sig = (len(G.nodes), len(G.edges), hash(frozenset(G.edges())))
+            cache = NetworkXSolution._pos_cache
+            pos = cache.get(sig)
+            if pos is None:
+                pos = cache[sig] = nx.spring_layout(G, dim=3, seed=0)
+                if len(cache) > self._POS_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(sig)
         
-        my_dict = {}
-        for key, value in self.flowDict.items():
-            for inner_key, inner_value in value.items():
-                if(inner_value > 0):
-                    my_dict[(key, inner_key)] = 1
+        # solve() only keeps non-zero flows, so every flowDict entry is a flow edge
+        flow_edges = {(key, inner_key) for key, value in self.flowDict.items() for inner_key in value}
         
         # Define colors for different edge types
         edge_color_map = {
@@ -77,27 +272,44 @@ class NetworkXSolution:
             'normal': 'black'        # Normal edges
         }
         
-        edge_trace = []
+        # One line trace per edge type; each type collects its edges' endpoint rows in coords
+        nodes = list(G.nodes())
+        node_index = {node: i for i, node in enumerate(nodes)}
+        coords = np.array([pos[node] for node in nodes], dtype=np.float32).reshape(-1, 3)
+        segments = {edge_type: ([], []) for edge_type in edge_color_map}
+        # Numeric node IDs, parsed once per node rather than twice per edge
+        node_ids = {node: int(node) for node in nodes}
+        M = self.M
         for edge in G.edges():
-            x0, y0, z0 = pos[edge[0]]
-            x1, y1, z1 = pos[edge[1]]
-            
-            # Determine edge color based on its properties
-            if (edge[0], edge[1]) in my_dict:
-                color = edge_color_map['flow']
-            elif (int(edge[1]) - int(edge[0])) == self.M:
-                color = edge_color_map['time']
+            # Determine edge type based on its properties
+            if (edge[0], edge[1]) in flow_edges:
+                edge_type = 'flow'
+            elif node_ids[edge[1]] - node_ids[edge[0]] == M:
+                edge_type = 'time'
             # elif self.is_artificial_edge(edge):
-            #     color = edge_color_map['artificial']
+            #     edge_type = 'artificial'
             elif self.is_restriction_violation(edge):
-                color = edge_color_map['restriction']
+                edge_type = 'restriction'
             else:
-                color = edge_color_map['normal']
+                edge_type = 'normal'
             
+            tails, heads = segments[edge_type]
+            tails.append(node_index[edge[0]])
+            heads.append(node_index[edge[1]])
+        
+        edge_trace = []
+        for edge_type, (tails, heads) in segments.items():
+            if not tails:
+                continue
+            # tail, head, NaN break per edge; float32 arrays go out as compact binary, not JSON lists
+            lines = np.full((len(tails), 3, 3), np.nan, dtype=np.float32)
+            lines[:, 0] = coords[tails]
+            lines[:, 1] = coords[heads]
+            xs, ys, zs = lines.reshape(-1, 3).T
             edge_trace.append(go.Scatter3d(
-                x=[x0, x1, None], y=[y0, y1, None], z=[z0, z1, None],
+                x=xs, y=ys, z=zs,
                 mode='lines',
-                line=dict(color=color, width=5),
+                line=dict(color=edge_color_map[edge_type], width=5),
                 hoverinfo='none'
             ))
         
@@ -119,9 +331,9 @@ class NetworkXSolution:
                 demand = G.nodes[node].get('demand', 0)
                 node_colors.append(node_color_map['normal'][demand])
         node_trace = go.Scatter3d(
-            x=[pos[node][0] for node in G.nodes()],
-            y=[pos[node][1] for node in G.nodes()],
-            z=[pos[node][2] for node in G.nodes()],
+            x=coords[:, 0],
+            y=coords[:, 1],
+            z=coords[:, 2],
             mode='markers+text',
             marker=dict(
                 size=10,
@@ -148,68 +360,152 @@ class NetworkXSolution:
         
         fig.add_trace(table_trace, row=1, col=1)
         fig.add_trace(node_trace, row=1, col=2)
-        for trace in edge_trace:
-            fig.add_trace(trace, row=1, col=2)
+        fig.add_traces(edge_trace, rows=1, cols=2)
         fig.update_layout(showlegend=False, title = 'Vẽ đồ thị cho tôi:',\
             title_text='3D Graph Visualization')
         fig.show()
 
     def read_dimac_file(self, file_path):
+        G = self.build_graph(file_path)
+        self.solve(G)
+
+    def build_graph(self, file_path):
+        """Parse a DIMACS file into a DiGraph (also stored as self.G) without solving it."""
         G = nx.DiGraph()
         self.G = G  # Store G as instance variable
         artificial_nodes = set()  # Track artificial nodes
-        countDemands = 0
-        posList = []
-        negList = []
-        with open(file_path, 'r') as file:
-            for line in file:
-                parts = line.split()
-                if parts[0] == 'c' and 'ArtificialNode' in line:
-                    # Extract node ID from comment line
-                    node_id = parts[2]
-                    artificial_nodes.add(node_id)
-                elif parts[0] == 'n':
-                    ID = parts[1]
-                    demand = (-1)*int(parts[2])
-                    countDemands += 1
-                    if demand > 0:
-                        posList.append(demand)
-                    else:
-                        negList.append(demand)
-                    G.add_node(ID, demand=demand, is_artificial=ID in artificial_nodes)
-                elif parts[0] == 'a':
-                    ID1 = (parts[1])
-                    ID2 = (parts[2])
-                    U = int(parts[4])
-                    C = int(parts[5])
-                    G.add_edge(ID1, ID2, weight=C, capacity=U)
+        violation_map = self._violation_map = {}
+        nodes = []
+
+        # Lines stay bytes; only the tokens that end up in the graph are decoded
+        def _handle_comment(line):
+            if b'ArtificialNode' in line:
+                # Extract node ID from comment line
+                artificial_nodes.add(line.split(None, 3)[2].decode())
+            elif line.startswith(b'c Edge') and b'violates' in line:
+                parts = line.split(None, 6)
+                if len(parts) >= 6:
+                    try:
+                        violation_map[(str(int(parts[2])), str(int(parts[3])))] = int(parts[5])
+                    except ValueError:
+                        pass
+
+        def _handle_node(line):
+            parts = line.split(None, 3)
+            ID = parts[1].decode()
+            nodes.append((ID, {'demand': (-1)*int(parts[2]), 'is_artificial': ID in artificial_nodes}))
+
+        handlers = {b'c ': _handle_comment, b'n ': _handle_node}
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        # Split the arc lines (the bulk of the file) off in C; only the rest is walked in Python
+        arc_block = b''.join(_ARC_LINES_RE.findall(data))
+        for line in _ARC_LINES_RE.sub(b'', data).splitlines():
+            handler = handlers.get(line[:2])
+            if handler is not None:
+                handler(line)
+        G.add_nodes_from(nodes)
+        if arc_block:
+            # a ID1 ID2 LB U C -> ID1, ID2, U, C
+            arcs = np.loadtxt(io.BytesIO(arc_block), dtype=np.int64, usecols=(1, 2, 4, 5), ndmin=2)
+            sources = map(str, arcs[:, 0].tolist())
+            targets = map(str, arcs[:, 1].tolist())
+            capacities = arcs[:, 2].tolist()
+            costs = arcs[:, 3].tolist()
+            G.add_edges_from((ID1, ID2, {'weight': C, 'capacity': U})
+                             for ID1, ID2, U, C in zip(sources, targets, capacities, costs))
+        self._find_escape_edges(G)
+        return G
+
+    def solve(self, G):
+        """Run network simplex on G and keep the non-zero flows in self.flowDict."""
+        if G is not getattr(self, 'G', None):
+            # Graph built elsewhere (not by build_graph): refresh the escape-edge set
+            self._find_escape_edges(G)
+        self.G = G
         import time
         start_time = time.time()
         # Restriction 2 5 4 1 1 2
-        pdb.set_trace()
-        self.flowCost, self.flowDict = nx.network_simplex(G)
+        if getattr(config, 'debug', 0):
+            import pdb; pdb.set_trace()
+        # Native solvers first (C++ network simplex, then OR-Tools), pure-Python simplex last
+        problem = FlowProblem.from_graph(G) if (MCFSIMPLEX_AVAILABLE or ORTOOLS_AVAILABLE) else None
+        if problem is None:
+            self.flowCost, flowDict = nx.network_simplex(G)
+            # Lọc các phần tử có giá trị khác 0, bỏ luôn các node không còn cạnh nào
+            self.flowDict = {key: sub for key, sub_dict in flowDict.items()
+                             if (sub := {k: v for k, v in sub_dict.items() if v})}
+        else:
+            self.solve_problem(problem)
         end_time = time.time()
         config.timeSolving += (end_time - start_time)
         config.totalSolving += 1
-        filtered_data = {}
-        for key, sub_dict in self.flowDict.items():
-            # Lọc các phần tử có giá trị khác 0
-            filtered_sub_dict = {k: v for k, v in sub_dict.items() if v != 0}
-            if filtered_sub_dict:
-                filtered_data[key] = filtered_sub_dict
-        self.flowDict = filtered_data
-        self.plot_graph_3d_interactive(G)
+        if config.draw:
+            self.plot_graph_3d_interactive(G)
         
+    def solve_problem(self, problem):
+        """
+        Solve an already flattened FlowProblem with the native solvers (MCFSimplex,
+        then OR-Tools); sets flowCost, and flowDict on first read.
+        """
+        if MCFSIMPLEX_AVAILABLE:
+            self.flowCost, flows = self._solve_with_mcfsimplex(problem)
+        else:
+            self.flowCost, flows = self._solve_with_ortools(problem)
+        # flowDict (already non-zero only) is built only if something reads it
+        self._pending_flows = (problem, flows)
+
+    def _solve_with_mcfsimplex(self, problem):
+        """Solve with MCFSimplex (C++ network simplex); returns (flowCost, per-arc flows)."""
+        n, m = len(problem.nodes), len(problem.tail)
+        mcf = pyMCFSimplex.MCFSimplex()
+        # MCFSimplex deficits use the NetworkX sign (negative at sources); node names are 1-based
+        mcf.LoadNet(n, m, n, m,
+                    pyMCFSimplex.CreateDoubleArrayFromList(problem.cap.tolist()),
+                    pyMCFSimplex.CreateDoubleArrayFromList(problem.cost.tolist()),
+                    pyMCFSimplex.CreateDoubleArrayFromList((-problem.supply).tolist()),
+                    pyMCFSimplex.CreateUIntArrayFromList((problem.tail + 1).tolist()),
+                    pyMCFSimplex.CreateUIntArrayFromList((problem.head + 1).tolist()))
+        mcf.SolveMCF()
+        status = mcf.MCFGetStatus()
+        if status != mcf.kOK:
+            raise nx.NetworkXUnfeasible(f"MCFSimplex failed with status {status}")
+        x = pyMCFSimplex.new_darray(m)
+        mcf.MCFGetX(x)
+        flows = np.rint([pyMCFSimplex.darray_get(x, arc) for arc in range(m)]).astype(np.int64)
+        return int(round(mcf.MCFGetFO())), flows
+
+    def _solve_with_ortools(self, problem):
+        """Solve with OR-Tools' native min cost flow; returns (flowCost, per-arc flows)."""
+        smcf = min_cost_flow.SimpleMinCostFlow()
+        arcs = smcf.add_arcs_with_capacity_and_unit_cost(problem.tail, problem.head, problem.cap, problem.cost)
+        smcf.set_nodes_supplies(np.arange(len(problem.nodes)), problem.supply)
+        status = smcf.solve()
+        if status != smcf.OPTIMAL:
+            raise nx.NetworkXUnfeasible(f"OR-Tools min cost flow failed with status {status}")
+        return smcf.optimal_cost(), np.asarray(smcf.flows(arcs))
+
     def write_trace(self, file_path = 'traces.txt'):
         #pdb.set_trace()
-
+        M = self.M
+        keys, inner_keys, values, s = [], [], [], []
+        for key, value in self.flowDict.items():
+            # s = k // M, or M when that is 0 -- once per source node, not per edge
+            s_key = int(key) // M or M
+            for inner_key, inner_value in value.items():
+                if(inner_value > 0):
+                    keys.append(key)
+                    inner_keys.append(inner_key)
+                    values.append(inner_value)
+                    s.append(s_key)
+        s, inner, values = (np.array(s, dtype=np.int64), np.array(inner_keys, dtype=np.int64),
+                            np.array(values, dtype=np.int64))
+        if self._cost_index is not None:
+            results = _sparse_trace_results(s, inner, values, M, self._cost_index).tolist()
+        else:
+            lut = self._cost_lut if self._cost_lut is not None else _NO_COST_LUT
+            results = _trace_results(s, inner, values, M, lut).tolist()
+        #print(f"a {key} {inner_key} 0 + {result} = {result}")
         with open(file_path, "w") as file:
-            for key, value in self.flowDict.items():
-                for inner_key, inner_value in value.items():
-                    if(inner_value > 0):
-                        s = int(key) // self.M + (self.M if int(key) // self.M == 0 else 0)
-                        t = int(inner_key) // self.M + (self.M if int(inner_key) // self.M == 0 else 0)
-                        cost = self.edges_with_costs.get((s, t), [-1, -1])[1]
-                        result = inner_value*cost
-                        #print(f"a {key} {inner_key} 0 + {result} = {result}")
-                        file.write(f"a {key} {inner_key} 0 + {result} = {result}\n")
+            file.write("".join([f"a {key} {inner_key} 0 + {result} = {result}\n"
+                                for key, inner_key, result in zip(keys, inner_keys, results)]))
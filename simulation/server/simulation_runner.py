@@ -1,8 +1,8 @@
 import sys
-import io
 import os
 import time
 import re
+from collections import deque
 from datetime import datetime
 
 # Giả định rằng các file của bạn đã được chuyển vào thư mục `core`
@@ -17,25 +17,60 @@ from . import config as sim_config # Import module config của bạn và đặt
 from .discrevpy import simulator
 
 # --- THAY ĐỔI QUAN TRỌNG ---
-# Vì chúng ta không thể dựa vào việc `print` ra console để lấy kết quả,
-# chúng ta cần một cách để "bắt" lại output này.
-# Phương pháp đơn giản nhất là tạm thời thay thế luồng output chuẩn (stdout).
-class StdoutCapture:
-    def __init__(self):
-        self.buffer = io.StringIO()
+# Kết quả (đường đi của AGV) được lấy trực tiếp từ các đối tượng AGV,
+# còn output in ra console chỉ được "bắt" lại để debug:
+# tạm thời thay thế luồng output chuẩn (stdout) bằng một luồng xử lý từng dòng.
+class StreamingCapture:
+    """
+    Thay sys.stdout trong lúc mô phỏng: mỗi dòng hoàn chỉnh được chuyển ngay cho
+    `on_line` rồi bỏ đi, chỉ giữ lại `max_lines` dòng cuối để trả về làm raw_log.
+    Bộ nhớ vì vậy không tăng theo độ dài log như khi gom toàn bộ vào StringIO.
+    """
+    def __init__(self, on_line=None, max_lines=2000):
+        self.on_line = on_line
+        self.tail = deque(maxlen=max_lines)
+        self.total_lines = 0
+        self._partial = ''
 
     def __enter__(self):
         self._original_stdout = sys.stdout
-        sys.stdout = self.buffer
+        sys.stdout = self
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         sys.stdout = self._original_stdout
+        if self._partial:
+            self._consume(self._partial)
+            self._partial = ''
+
+    def write(self, s):
+        lines = (self._partial + s).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._consume(line)
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def _consume(self, line):
+        self.total_lines += 1
+        self.tail.append(line)
+        if self.on_line is not None:
+            self.on_line(line)
 
     def get_value(self):
-        return self.buffer.getvalue()
+        """Phần log còn giữ lại (tối đa `max_lines` dòng cuối)."""
+        skipped = self.total_lines - len(self.tail)
+        header = [f"... ({skipped} dòng đầu đã được lược bỏ)"] if skipped else []
+        return '\n'.join(header + list(self.tail))
 
 # --- HÀM HỖ TRỢ PHÂN TÍCH OUTPUT ---
+# Regex để tìm các dòng kết quả, ví dụ: "1===(14)===3===(8.0)===80===END. Total cost: 22.0."
+# và "The total cost of AGV1 is 22.0"
+_PATH_RE = re.compile(r"(\d+===\(.*===\d+.*END\.)")
+_ID_RE = re.compile(r"The total cost of AGV(\d+) is")
+
 def parse_solution_from_log(log_output):
     """
     Hàm này sẽ phân tích toàn bộ output dạng text bắt được từ console
@@ -44,24 +79,24 @@ def parse_solution_from_log(log_output):
     chính xác với định dạng output của chương trình bạn.
     """
     solutions = []
-    # Regex để tìm các dòng kết quả, ví dụ: "1===(14)===3===(8.0)===80===END. Total cost: 22.0."
-    # và "The total cost of AGV1 is 22.0"
-    path_pattern = re.compile(r"(\d+===\(.*===\d+.*END\.)")
-    id_pattern = re.compile(r"The total cost of AGV(\d+) is")
 
     # Tách log thành từng dòng để xử lý
     lines = log_output.splitlines()
     agv_id = None
     
     for line in lines:
+        # Chỉ chạy regex trên những dòng có thể khớp
         # Tìm ID của AGV trước
-        id_match = id_pattern.search(line)
-        if id_match:
-            agv_id = int(id_match.group(1))
+        if 'The total cost of AGV' in line:
+            id_match = _ID_RE.search(line)
+            if id_match:
+                agv_id = int(id_match.group(1))
 
         # Nếu đã có ID, tìm đường đi tương ứng
-        path_match = path_pattern.search(line)
-        if path_match and agv_id is not None:
+        if agv_id is None or 'END.' not in line:
+            continue
+        path_match = _PATH_RE.search(line)
+        if path_match:
             path_str = path_match.group(1)
             
             # Phân tích chuỗi path để ra các bước
@@ -74,7 +109,9 @@ def parse_solution_from_log(log_output):
 
             # Lặp qua các cặp (thời gian, node)
             for i in range(1, len(parts) - 2, 2):
-                time_val = int(re.search(r'\((\d+)\)', parts[i]).group(1))
+                # "(14)" -> 14, "(3)/(5)" -> 3
+                time_str = parts[i].partition('(')[2].partition(')')[0]
+                time_val = int(time_str) if time_str.isdigit() else float(time_str)
                 node_val = int(parts[i+1])
                 path_details.append({"node": node_val, "time": time_val})
             
@@ -87,6 +124,32 @@ def parse_solution_from_log(log_output):
 
     return solutions
 
+def collect_solutions(all_agvs):
+    """
+    Lấy đường đi của các AGV trực tiếp từ `agv.path_history` (được ghi lại
+    khi AGV kết thúc hành trình), không cần phân tích lại log bằng regex.
+    """
+    solutions = []
+    for agv in all_agvs:
+        history = getattr(agv, 'path_history', None)
+        if not history:
+            continue
+        agv_id = str(agv.id)
+        digits = agv_id[3:] if agv_id.startswith('AGV') else agv_id
+        steps = [str(history[0]["node"])]
+        for step in history[1:]:
+            steps.append(f'({step["time"]})')
+            steps.append(str(step["node"]))
+        solutions.append({
+            "agent_id": int(digits) if digits.isdigit() else agv.id,
+            "path_string": '==='.join(steps) + '===END.',
+            "path_details": history
+        })
+    # all_agvs là set: sắp theo ID số (AGV2 trước AGV10), ID không phải số xếp sau
+    solutions.sort(key=lambda solution: (0, solution["agent_id"], "") if isinstance(solution["agent_id"], int)
+                   else (1, 0, str(solution["agent_id"])))
+    return solutions
+
 # --- HÀM MÔ PHỎNG CHÍNH ---
 def run_simulation(api_config):
     """
@@ -134,7 +197,11 @@ def run_simulation(api_config):
     Event.setValue("allAGVs", allAGVs)
 
     # --- BƯỚC 3: CHẠY MÔ PHỎNG VÀ BẮT LẤY OUTPUT ---
-    with StdoutCapture() as capture:
+    server_stdout = sys.stdout
+    print("--- Captured Log ---")
+    # Mỗi dòng được in ngay ra console của server để debug, không gom lại cả log
+    with StreamingCapture(on_line=lambda line: server_stdout.write(line + '\n'),
+                          max_lines=api_config.get('raw_log_lines', 2000)) as capture:
         def schedule_events(events):
             for event in events:
                 simulator.schedule(event.start_time, event.process)
@@ -142,15 +209,13 @@ def run_simulation(api_config):
         simulator.ready()
         schedule_events(events)
         simulator.run()
+    print("--- End Captured Log ---")
     
-    # Lấy toàn bộ những gì đã được in ra console
+    # Phần cuối của log (gửi kèm cho client)
     captured_log = capture.get_value()
-    print("--- Captured Log ---")
-    print(captured_log) # In ra console của server để debug
-    print("--- End Captured Log ---")
 
-    # --- BƯỚC 4: PHÂN TÍCH OUTPUT VÀ TRẢ VỀ KẾT QUẢ ---
-    solutions = parse_solution_from_log(captured_log)
+    # --- BƯỚC 4: LẤY KẾT QUẢ TRỰC TIẾP TỪ CÁC AGV ---
+    solutions = collect_solutions(Event.getValue("allAGVs"))
 
     # Đọc nội dung file map để trả về cho client vẽ
     try:
@@ -165,7 +230,7 @@ def run_simulation(api_config):
         "status": "success",
         "solutions": solutions,
         "map_data": map_content,
-        "raw_log": captured_log # Gửi kèm log thô để debug phía client nếu cần
+        "raw_log": captured_log # Gửi kèm phần cuối log thô để debug phía client nếu cần
     }
 
     return final_result
\ No newline at end of file
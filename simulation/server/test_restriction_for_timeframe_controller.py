@@ -6,26 +6,27 @@ import networkx as nx
 from controller.RestrictionForTimeFrameController import RestrictionForTimeFrameController
 
 
+class _StubGP:
+    """Plain stand-in for GraphProcessor: attribute reads are slot reads, not Mock lookups"""
+    __slots__ = ('M', 'H', 'alpha', 'beta', 'gamma', 'ur', 'ts_edges', 'ts_nodes', 'map_nodes', 'tsedges',
+                 'check_and_add_nodes', 'create_set_of_edges')
+
+    def get_max_id(self):
+        return 100
+
+
 class TestRestrictionForTimeFrameController(unittest.TestCase):
     
-    def setUp(self):
-        """Set up test environment with mocked GraphProcessor"""
-        # Create a mock GraphProcessor
-        self.mock_graph_processor = Mock()
-        self.mock_graph_processor.M = 3  # 3x3 grid for simple testing
-        self.mock_graph_processor.H = 4  # 4 time steps
-        self.mock_graph_processor.alpha = 1.0
-        self.mock_graph_processor.beta = 1.0
-        self.mock_graph_processor.gamma = 100.0
-        self.mock_graph_processor.ur = 1
-        
+    @classmethod
+    def setUpClass(cls):
+        """Build the static test TSG once for the whole test case"""
         # Create a simple TSG for testing
         # Node IDs: spatial_coord + time * M (time starts from 0)
         # For 3x3 grid: nodes 1,2,3 at time 0 -> TSG nodes 1,2,3
         #               nodes 1,2,3 at time 1 -> TSG nodes 4,5,6
         #               nodes 1,2,3 at time 2 -> TSG nodes 7,8,9
         # Edge (1,1) spatial appears at times 0->1 and 1->2 as TSG edges (1,4) and (4,7)
-        self.mock_ts_edges = [
+        cls._BASE_EDGES = (
             (1, 4, 0, 1, 10),  # spatial (1,1) from time 0 to time 1
             (2, 5, 0, 1, 10),  # spatial (2,2) from time 0 to time 1
             (4, 7, 0, 1, 10),  # spatial (1,1) from time 1 to time 2
@@ -33,28 +34,33 @@ class TestRestrictionForTimeFrameController(unittest.TestCase):
             (1, 2, 0, 1, 5),   # spatial (1,2) horizontal edge at time 0
             (4, 5, 0, 1, 5),   # spatial (1,2) horizontal edge at time 1
             (7, 8, 0, 1, 5),   # spatial (1,2) horizontal edge at time 2
-        ]
+        )
+    
+    def setUp(self):
+        """Set up test environment with a stub GraphProcessor"""
+        # Create a stub GraphProcessor
+        self.mock_graph_processor = _StubGP()
+        self.mock_graph_processor.M = 3  # 3x3 grid for simple testing
+        self.mock_graph_processor.H = 4  # 4 time steps
+        self.mock_graph_processor.alpha = 1.0
+        self.mock_graph_processor.beta = 1.0
+        self.mock_graph_processor.gamma = 100.0
+        self.mock_graph_processor.ur = 1
+        
+        # Only the list handed to the processor is mutable per test
+        self.mock_ts_edges = list(self._BASE_EDGES)
         
-        self.mock_graph_processor.ts_edges = self.mock_ts_edges.copy()
+        self.mock_graph_processor.ts_edges = self.mock_ts_edges
         self.mock_graph_processor.ts_nodes = []
         self.mock_graph_processor.map_nodes = {}
         self.mock_graph_processor.tsedges = []
         
-        # Mock methods
-        self.mock_graph_processor.get_max_id.return_value = 100
+        # Mock only the methods whose calls are worth asserting
         self.mock_graph_processor.check_and_add_nodes = Mock()
         self.mock_graph_processor.create_set_of_edges = Mock()
         
         # Create controller instance
         self.controller = RestrictionForTimeFrameController(self.mock_graph_processor)
-        
-        # Store original ts_edges for restoration tests
-        self.original_ts_edges = self.mock_ts_edges.copy()
-        
-    def tearDown(self):
-        """Clean up after each test"""
-        # Reset the mock_graph_processor.ts_edges to original state
-        self.mock_graph_processor.ts_edges = self.original_ts_edges.copy()
 
     # =============================================================================
     # Tests for identify_restricted_edges()
@@ -136,6 +142,26 @@ class TestRestrictionForTimeFrameController(unittest.TestCase):
         self.assertEqual(len(omega), 1)
         self.assertIn((4, 5, 0, 1, 5), omega)
 
+    def test_identify_edges_rebuilds_arrays_when_ts_edges_change(self):
+        """Test that the ts_edges arrays are reused, and rebuilt after ts_edges changes"""
+        # Given: a first lookup builds the arrays
+        restriction_edges = [[1, 2]]
+        omega = self.controller.identify_restricted_edges(restriction_edges, 0, 4)
+        self.assertEqual(omega, [(4, 5, 0, 1, 5), (7, 8, 0, 1, 5)])
+        edges_np = self.controller._edges_np
+
+        # When: ts_edges is unchanged, the same arrays are reused
+        self.controller.identify_restricted_edges(restriction_edges, 0, 4)
+        self.assertIs(self.controller._edges_np, edges_np)
+
+        # When: a spatial (1,2) edge at time 3 is appended in place
+        self.mock_graph_processor.ts_edges.append((10, 11, 0, 1, 5))
+        omega = self.controller.identify_restricted_edges(restriction_edges, 0, 4)
+
+        # Then: the arrays are rebuilt and the new edge is found
+        self.assertIsNot(self.controller._edges_np, edges_np)
+        self.assertEqual(omega, [(4, 5, 0, 1, 5), (7, 8, 0, 1, 5), (10, 11, 0, 1, 5)])
+
     # =============================================================================
     # Tests for calculate_max_flow()
     # =============================================================================
@@ -154,8 +180,8 @@ class TestRestrictionForTimeFrameController(unittest.TestCase):
         # Mock NetworkX to return expected max flow
         mock_max_flow_value.return_value = 2
         
-        # When: call calculate_max_flow
-        result = self.controller.calculate_max_flow(omega, incoming_capacity, outgoing_capacity)
+        # When: call calculate_max_flow on the NetworkX path
+        result = self.controller.calculate_max_flow(omega, incoming_capacity, outgoing_capacity, use_scipy=False)
         
         # Then: should return 2 (can flow through both parallel edges)
         self.assertEqual(result, 2)
@@ -174,6 +200,62 @@ class TestRestrictionForTimeFrameController(unittest.TestCase):
         self.assertTrue(graph.has_edge(2, "vT"))
         self.assertTrue(graph.has_edge(3, "vT"))
 
+    def test_calculate_max_flow_reuses_graph_across_calls(self):
+        """Test that a second max flow call updates the previous graph to the new omega"""
+        # Given: a first call over two parallel edges
+        first = self.controller.calculate_max_flow(
+            [(1, 2, 0, 1, 10), (1, 3, 0, 1, 10)], {1: 2}, {2: 1, 3: 1}, use_scipy=False
+        )
+        graph = self.controller._flow_graph
+
+        # When: the next restriction has a single edge with a larger capacity
+        second = self.controller.calculate_max_flow(
+            [(4, 5, 0, 3, 10)], {4: 5}, {5: 2}, use_scipy=False
+        )
+
+        # Then: the same graph is reused, holding only the new edges
+        self.assertEqual(first, 2)
+        self.assertEqual(second, 2)
+        self.assertIs(self.controller._flow_graph, graph)
+        self.assertEqual(set(graph.edges()), {(4, 5), ("vS", 4), (5, "vT")})
+        self.assertEqual(set(graph.nodes()), {"vS", "vT", 4, 5})
+
+    def test_calculate_max_flow_scipy_matches_networkx(self):
+        """Test that the scipy max flow agrees with NetworkX, including a bottleneck"""
+        # Given: two paths into node 3, whose only exit carries 2 units
+        omega = [
+            (1, 3, 0, 2, 10),
+            (2, 3, 0, 2, 10),
+            (3, 4, 0, 5, 10),
+        ]
+        incoming_capacity = {1: 3, 2: 3}
+        outgoing_capacity = {4: 2}
+
+        # When: call calculate_max_flow on both paths
+        scipy_flow = self.controller.calculate_max_flow(omega, incoming_capacity, outgoing_capacity)
+        networkx_flow = self.controller.calculate_max_flow(omega, incoming_capacity, outgoing_capacity, use_scipy=False)
+
+        # Then: both are limited by the exit capacity
+        self.assertEqual(scipy_flow, 2)
+        self.assertEqual(networkx_flow, 2)
+
+    @patch('networkx.maximum_flow_value')
+    def test_calculate_max_flow_stops_at_capacity_bound(self, mock_max_flow_value):
+        """Test that no max flow is computed when the boundary capacity cannot exceed flow_limit"""
+        # Given: at most 1 unit can leave the restricted nodes
+        omega = [(1, 2, 0, 5, 10)]
+        incoming_capacity = {1: 4}
+        outgoing_capacity = {2: 1}
+
+        # When: call calculate_max_flow with a limit of 1, and with no exit at all
+        bounded_flow = self.controller.calculate_max_flow(omega, incoming_capacity, outgoing_capacity, use_scipy=False, flow_limit=1)
+        no_exit_flow = self.controller.calculate_max_flow(omega, incoming_capacity, {}, use_scipy=False)
+
+        # Then: the bound is returned without running NetworkX
+        self.assertEqual(bounded_flow, 1)
+        self.assertEqual(no_exit_flow, 0)
+        mock_max_flow_value.assert_not_called()
+
     # =============================================================================
     # Tests for apply_restriction()
     # =============================================================================
@@ -237,7 +319,7 @@ class TestRestrictionForTimeFrameController(unittest.TestCase):
         mock_calc_max_flow.return_value = 3  # F=3 > U=1
         
         # Store original edges before applying restriction
-        original_ts_edges = self.mock_graph_processor.ts_edges.copy()
+        original_ts_edges = self._BASE_EDGES
         
         # When: call apply_restriction
         self.controller.apply_restriction()
@@ -365,6 +447,38 @@ class TestRestrictionForTimeFrameController(unittest.TestCase):
         
         self.assertEqual(dict(outgoing_capacity), dict(expected))
 
+    def test_capacity_maps_returns_incoming_and_outgoing(self):
+        """Test that _capacity_maps computes both capacity maps in one pass"""
+        # Given: TSG with edges into, out of and inside the restricted set
+        TSG = [
+            (10, 1, 0, 2, 10),  # external -> restricted (incoming 2)
+            (11, 1, 0, 3, 10),  # external -> restricted (incoming 3, same node)
+            (1, 4, 0, 1, 10),   # restricted -> restricted (ignored)
+            (4, 21, 0, 3, 10),  # restricted -> external (outgoing 3)
+        ]
+        restricted_nodes = {1, 4}
+
+        # When: call _capacity_maps
+        incoming_capacity, outgoing_capacity = self.controller._capacity_maps(TSG, restricted_nodes)
+
+        # Then: capacities are summed per node on each side
+        self.assertEqual(dict(incoming_capacity), {1: 5})
+        self.assertEqual(dict(outgoing_capacity), {4: 3})
+
+    def test_virtual_node_demand_lookup(self):
+        """Test that per-node and vectorized demand lookups agree with the demand mapping"""
+        # Given: demands for one pair of virtual nodes
+        self.controller._virtual_node_demands = {30: 2, 31: -2}
+
+        # When: look up virtual and ordinary node ids
+        node_ids = [30, 31, 1, 500]
+        demands = self.controller.apply_demands(node_ids)
+
+        # Then: virtual nodes carry their demand, every other id gets 0
+        self.assertEqual(demands.tolist(), [2, -2, 0, 0])
+        self.assertEqual([self.controller.get_virtual_node_demand(n) for n in node_ids], [2, -2, 0, 0])
+        self.assertEqual(self.controller.get_virtual_node_demands(), {30: 2, 31: -2})
+
     def test_calculate_virtual_flow(self):
         """Test calculation of virtual flow needed"""
         # Test cases for virtual flow calculation